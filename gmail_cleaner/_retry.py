@@ -0,0 +1,98 @@
+"""Retry Gmail API calls that fail with rate-limit or transient server errors."""
+
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from googleapiclient.discovery import Resource  # type: ignore[import-untyped]
+from googleapiclient.errors import HttpError  # type: ignore[import-untyped]
+
+MAX_RETRIES = 5
+MAX_DELAY = 64.0
+
+RETRYABLE_STATUSES = {429, 500, 502, 503}
+
+BatchCallback = Callable[[str, Any, Exception | None], None]
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check if an error is a rate limit or transient server error."""
+    if not isinstance(error, HttpError):
+        return False
+
+    status = error.resp.status
+    if status in RETRYABLE_STATUSES:
+        return True
+    # Gmail reports per-user rate limits as 403 rather than 429
+    return status == 403 and b"ateLimitExceeded" in (error.content or b"")
+
+
+def backoff_delay(attempt: int, error: Exception | None = None) -> float:
+    """Seconds to wait before retry `attempt` (0-based), with jitter.
+
+    Honors a Retry-After header on the error when present, capped at
+    MAX_DELAY.
+    """
+    if isinstance(error, HttpError):
+        retry_after = error.resp.get("retry-after")
+        if retry_after:
+            try:
+                return min(MAX_DELAY, float(retry_after))
+            except ValueError:
+                pass
+
+    return min(MAX_DELAY, 2.0 ** attempt) + random.random()
+
+
+def execute_with_backoff(request: Any, max_retries: int = MAX_RETRIES) -> Any:
+    """Execute a request, retrying retryable errors with exponential backoff."""
+    for attempt in range(max_retries):
+        try:
+            return request.execute()
+        except HttpError as e:
+            if not is_retryable(e) or attempt == max_retries - 1:
+                raise
+            time.sleep(backoff_delay(attempt, e))
+
+
+def execute_batch_with_backoff(
+    service: Resource,
+    requests: dict[str, Any],
+    callback: BatchCallback,
+    batch_size: int,
+    max_retries: int = MAX_RETRIES,
+) -> None:
+    """Execute requests in batches of `batch_size`, keyed by request id.
+
+    Items that fail with a retryable error are re-sent in a later round
+    after a backoff delay; `callback` only sees each item's final outcome.
+    """
+    pending = dict(requests)
+
+    for attempt in range(max_retries):
+        retry: dict[str, Any] = {}
+        last_attempt = attempt == max_retries - 1
+
+        def on_response(
+            request_id: str,
+            response: Any,
+            exception: Exception | None,
+        ) -> None:
+            if exception is not None and is_retryable(exception) and not last_attempt:
+                retry[request_id] = pending[request_id]
+            else:
+                callback(request_id, response, exception)
+
+        ids = list(pending)
+        for start in range(0, len(ids), batch_size):
+            batch = service.new_batch_http_request(callback=on_response)
+            for request_id in ids[start:start + batch_size]:
+                batch.add(pending[request_id], request_id=request_id)
+            execute_with_backoff(batch, max_retries)
+
+        if not retry:
+            return
+
+        pending = retry
+        time.sleep(backoff_delay(attempt))
@@ -1,41 +1,109 @@
 """Email classification using Ollama LLM."""
 
-import json
+import asyncio
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
 from typing import Any
 
 import ollama
+import orjson
 
-from gmail_cleaner.types import Category, EmailData
+from gmail_cleaner.classifier_cache import ClassificationCache
+from gmail_cleaner.types import Category, DEFAULT_RULES, EmailData
 
 
-CLASSIFICATION_PROMPT = """Classify this email into exactly one category:
+# Static rubric shared by every classification request. Keeping it in a fixed
+# system message means each request starts with an identical prefix, which
+# Ollama can reuse from its KV cache instead of re-processing it every time.
+SYSTEM_PROMPT = """You classify emails into exactly one category:
 - NEEDS_REPLY: Requires a response from me
 - NEEDS_ACTION: Requires me to do something (not a reply)
 - FYI: Informational, read later, no action needed
 - ARCHIVE: Low value, newsletters I don't read, notifications
 - IGNORE: Spam, marketing, completely irrelevant
 
-Email:
+Respond with JSON only."""
+
+
+USER_PROMPT_TEMPLATE = """Email:
 From: {sender}
 Subject: {subject}
 Preview: {snippet}
 Date: {date}
 
-Respond with JSON only:
+Respond with:
 {{"category": "...", "reason": "one sentence"}}"""
 
 
-SUMMARY_PROMPT = """Summarize these emails in a bullet list. Each bullet should be one short sentence describing what the email is about.
-
-Emails:
+BATCH_USER_PROMPT_TEMPLATE = """Emails:
 {emails}
 
+Respond with one result per email, using the email's number as "id":
+{{"results": [{{"id": 1, "category": "...", "reason": "one sentence"}}]}}"""
+
+
+# Default for how long Ollama keeps the model (and its cached system-prompt
+# prefix) loaded after the last request; long enough to span drill-down and
+# the summary/apply steps of a run.
+KEEP_ALIVE = "30m"
+
+
+# Maximum in-flight classification requests. Ollama only serves requests in
+# parallel when the server is started with OLLAMA_NUM_PARALLEL >= this value;
+# otherwise extra requests simply queue server-side.
+DEFAULT_CONCURRENCY = 4
+
+
+# Minimum seconds between redraws of the terminal progress counter
+PROGRESS_INTERVAL = 0.1
+
+
+# Outermost {...} in an LLM response, which may wrap the JSON in extra text
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def compile_rules(rules: list[dict[str, str]]) -> list[tuple[re.Pattern[str], Category]]:
+    """Compile config rules ({"pattern", "category"}), skipping invalid ones."""
+    compiled: list[tuple[re.Pattern[str], Category]] = []
+    for rule in rules:
+        try:
+            compiled.append((
+                re.compile(rule["pattern"], re.I),
+                Category(rule["category"]),
+            ))
+        except (KeyError, TypeError, ValueError, re.error) as e:
+            print(f"Ignoring invalid rule {rule!r}: {e}")
+    return compiled
+
+
+# Sender/subject patterns that classify an email without asking the LLM.
+# The first matching rule wins.
+_RULES = compile_rules(DEFAULT_RULES)
+
+
+# Reasons produced by fallback paths; these results are not worth caching.
+_UNCACHEABLE_REASONS = ("Classification failed", "Failed to parse", "Unknown category")
+
+
+SUMMARY_SYSTEM_PROMPT = """You summarize emails in a bullet list. Each bullet should be one short sentence describing what the email is about.
+
 Respond with bullet points only, one per email."""
 
 
+SUMMARY_PROMPT = """Emails:
+{emails}"""
+
+# SUMMARY_PROMPT split around its placeholder, so building a prompt is a
+# plain join rather than a str.format over the template
+_SUMMARY_PRE, _SUMMARY_POST = SUMMARY_PROMPT.split("{emails}")
+
+
 def build_classification_prompt(email: EmailData) -> str:
-    """Build the classification prompt for an email."""
-    return CLASSIFICATION_PROMPT.format(
+    """Build the per-email part of the classification prompt."""
+    return USER_PROMPT_TEMPLATE.format(
         sender=email.sender,
         subject=email.subject,
         snippet=email.snippet,
@@ -43,28 +111,41 @@ def build_classification_prompt(email: EmailData) -> str:
     )
 
 
+def build_batch_classification_prompt(batch: list[EmailData]) -> str:
+    """Build the per-batch part of the classification prompt."""
+    email_list = "\n\n".join([
+        f"[{i}] From: {e.sender}\nSubject: {e.subject}\nPreview: {e.snippet}\nDate: {e.date}"
+        for i, e in enumerate(batch, start=1)
+    ])
+    return BATCH_USER_PROMPT_TEMPLATE.format(emails=email_list)
+
+
 def build_summary_prompt(emails: list[EmailData]) -> str:
-    """Build the summary prompt for a list of emails."""
+    """Build the per-category part of the summary prompt."""
     email_list = "\n".join([
         f"- From: {e.sender}, Subject: {e.subject}, Preview: {e.snippet[:100]}"
         for e in emails
     ])
-    return SUMMARY_PROMPT.format(emails=email_list)
+    return "".join((_SUMMARY_PRE, email_list, _SUMMARY_POST))
+
+
+def _messages(system_prompt: str, user_prompt: str) -> list[dict[str, str]]:
+    """Build chat messages with a static system prefix and variable user part."""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
 
 
 def parse_classification_response(response: str) -> tuple[Category, str]:
     """Parse LLM response to extract category and reason."""
     try:
-        # Try to extract JSON from response
-        response = response.strip()
+        # Handle case where response has extra text around the JSON
+        match = _JSON_RE.search(response)
+        if match:
+            response = match.group(0)
 
-        # Handle case where response has extra text
-        if "{" in response:
-            start = response.index("{")
-            end = response.rindex("}") + 1
-            response = response[start:end]
-
-        data = json.loads(response)
+        data = orjson.loads(response)
         category_str = data.get("category", "FYI")
         reason = data.get("reason", "")
 
@@ -75,109 +156,344 @@ def parse_classification_response(response: str) -> tuple[Category, str]:
             return Category.FYI, f"Unknown category: {category_str}"
 
         return category, str(reason)
-    except (json.JSONDecodeError, ValueError) as e:
+    except (orjson.JSONDecodeError, ValueError) as e:
         return Category.FYI, f"Failed to parse response: {str(e)}"
 
 
-def classify_single_email(email: EmailData, model: str) -> dict[str, Any]:
+def _match_rule(
+    email: EmailData,
+    rules: list[tuple[re.Pattern[str], Category]],
+) -> dict[str, Any] | None:
+    """Classify an email from the first matching rule, if any."""
+    for pattern, category in rules:
+        if pattern.search(email.sender) or pattern.search(email.subject):
+            return {
+                "email_id": email.id,
+                "category": category.value,
+                "reason": f"rule: {pattern.pattern}",
+                "skip": False,
+            }
+    return None
+
+
+def _classification_result(email: EmailData, response: Any) -> dict[str, Any]:
+    """Build a classification result dict from an Ollama chat response."""
+    content = response.get("message", {}).get("content", "")
+    category, reason = parse_classification_response(content)
+
+    return {
+        "email_id": email.id,
+        "category": category.value,
+        "reason": reason,
+        "skip": False,
+    }
+
+
+def _failed_result(email: EmailData, error: Exception) -> dict[str, Any]:
+    """Build the fallback result for an email whose classification failed."""
+    return {
+        "email_id": email.id,
+        "category": Category.FYI.value,
+        "reason": f"Classification failed: {str(error)}",
+        "skip": False,
+    }
+
+
+def parse_batch_classification_response(
+    response: str,
+    batch: list[EmailData],
+) -> list[dict[str, Any]] | None:
+    """Parse a batch LLM response into per-email results.
+
+    Returns None if the response can't be parsed or doesn't cover every email
+    in the batch, so the caller can fall back to classifying one at a time.
+    """
+    try:
+        match = _JSON_RE.search(response)
+        if match:
+            response = match.group(0)
+
+        items = orjson.loads(response).get("results", [])
+        by_id = {int(item["id"]): item for item in items}
+    except (orjson.JSONDecodeError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+    if len(by_id) != len(batch):
+        return None
+
+    results: list[dict[str, Any]] = []
+    for i, email in enumerate(batch, start=1):
+        item = by_id.get(i)
+        if item is None:
+            return None
+
+        category_str = item.get("category", "FYI")
+        try:
+            category = Category(category_str)
+            reason = str(item.get("reason", ""))
+        except ValueError:
+            category = Category.FYI
+            reason = f"Unknown category: {category_str}"
+
+        results.append({
+            "email_id": email.id,
+            "category": category.value,
+            "reason": reason,
+            "skip": False,
+        })
+
+    return results
+
+
+def classify_single_email(
+    email: EmailData,
+    model: str,
+    keep_alive: str = KEEP_ALIVE,
+) -> dict[str, Any]:
     """Classify a single email using Ollama."""
     prompt = build_classification_prompt(email)
 
     try:
         response = ollama.chat(
             model=model,
-            messages=[{"role": "user", "content": prompt}],
+            messages=_messages(SYSTEM_PROMPT, prompt),
+            keep_alive=keep_alive,
         )
-        content = response.get("message", {}).get("content", "")
-        category, reason = parse_classification_response(content)
+        return _classification_result(email, response)
+    except Exception as e:
+        return _failed_result(email, e)
 
-        return {
-            "email_id": email.id,
-            "category": category.value,
-            "reason": reason,
-            "skip": False,
-        }
+
+async def _aclassify_single_email(
+    email: EmailData,
+    client: ollama.AsyncClient,
+    model: str,
+    sem: asyncio.Semaphore,
+    keep_alive: str = KEEP_ALIVE,
+) -> dict[str, Any]:
+    """Classify a single email without blocking other in-flight requests."""
+    prompt = build_classification_prompt(email)
+
+    try:
+        async with sem:
+            response = await client.chat(
+                model=model,
+                messages=_messages(SYSTEM_PROMPT, prompt),
+                keep_alive=keep_alive,
+            )
+        return _classification_result(email, response)
     except Exception as e:
-        return {
-            "email_id": email.id,
-            "category": Category.FYI.value,
-            "reason": f"Classification failed: {str(e)}",
-            "skip": False,
-        }
+        return _failed_result(email, e)
 
 
-def classify_emails(
+async def _aclassify_batch(
+    batch: list[EmailData],
+    client: ollama.AsyncClient,
+    model: str,
+    sem: asyncio.Semaphore,
+    keep_alive: str = KEEP_ALIVE,
+) -> list[dict[str, Any]]:
+    """Classify a batch of emails with one request, falling back per email."""
+    if len(batch) == 1:
+        return [await _aclassify_single_email(batch[0], client, model, sem, keep_alive)]
+
+    prompt = build_batch_classification_prompt(batch)
+    results: list[dict[str, Any]] | None = None
+
+    try:
+        async with sem:
+            response = await client.chat(
+                model=model,
+                messages=_messages(SYSTEM_PROMPT, prompt),
+                keep_alive=keep_alive,
+            )
+        content = response.get("message", {}).get("content", "")
+        results = parse_batch_classification_response(content, batch)
+    except Exception:
+        results = None
+
+    if results is None:
+        results = list(await asyncio.gather(*[
+            _aclassify_single_email(e, client, model, sem, keep_alive) for e in batch
+        ]))
+
+    return results
+
+
+async def classify_emails_async(
     emails: list[EmailData],
     model: str,
     batch_size: int = 5,
     progress_callback: Any = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache: ClassificationCache | None = None,
+    keep_alive: str = KEEP_ALIVE,
+    rules: list[tuple[re.Pattern[str], Category]] | None = None,
 ) -> list[dict[str, Any]]:
-    """Classify a list of emails using Ollama."""
-    results: list[dict[str, Any]] = []
+    """Classify a list of emails, `batch_size` emails per Ollama request.
+
+    Emails matching one of `rules` (default: the built-in sender/subject
+    rules; pass [] to disable) or found in `cache` are answered without
+    calling Ollama, and new classifications are added to the cache; the
+    caller persists it with cache.save().
+    """
+    if rules is None:
+        rules = _RULES
+
     total = len(emails)
+    results: list[dict[str, Any] | None] = [None] * total
+    uncached: list[int] = []
 
     for i, email in enumerate(emails):
-        result = classify_single_email(email, model)
-        results.append(result)
+        ruled = _match_rule(email, rules)
+        if ruled:
+            results[i] = ruled
+            continue
 
-        if progress_callback:
-            progress_callback(i + 1, total)
+        hit = cache.get(email, model) if cache else None
+        if hit:
+            category, reason = hit
+            results[i] = {
+                "email_id": email.id,
+                "category": category,
+                "reason": reason,
+                "skip": False,
+            }
         else:
-            print(f"\rClassifying... [{i + 1}/{total}]", end="", flush=True)
-
-    print()  # Newline after progress
-    return results
+            uncached.append(i)
+
+    sem = asyncio.Semaphore(concurrency)
+    done = total - len(uncached)
+
+    # Redraw the progress counter at most every PROGRESS_INTERVAL seconds,
+    # and only on a terminal
+    is_tty = not progress_callback and sys.stdout.isatty()
+    last_report = 0.0
+
+    step = max(batch_size, 1)
+    batches = [uncached[i:i + step] for i in range(0, len(uncached), step)]
+
+    async with ollama.AsyncClient() as client:
+
+        async def classify_batch(
+            indices: list[int],
+        ) -> tuple[list[int], list[dict[str, Any]]]:
+            batch = [emails[i] for i in indices]
+            return indices, await _aclassify_batch(batch, client, model, sem, keep_alive)
+
+        # Report progress as batches actually finish rather than in submission
+        # order, so one slow batch doesn't hold back the counter.
+        tasks = [asyncio.create_task(classify_batch(b)) for b in batches]
+        for next_done in asyncio.as_completed(tasks):
+            indices, batch_results = await next_done
+            for i, result in zip(indices, batch_results):
+                results[i] = result
+            done += len(indices)
+            if progress_callback:
+                progress_callback(done, total)
+            elif is_tty:
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL or done == total:
+                    sys.stdout.write(f"\rClassifying... [{done}/{total}]")
+                    sys.stdout.flush()
+                    last_report = now
+
+    if cache:
+        for i in uncached:
+            classified = results[i]
+            if classified and not classified["reason"].startswith(_UNCACHEABLE_REASONS):
+                cache.put(emails[i], model, classified["category"], classified["reason"])
+
+    if is_tty:
+        print()  # Newline after progress
+    elif not progress_callback:
+        print(f"Classified {total} emails.")
+    return [result for result in results if result is not None]
 
 
-def generate_summaries(
+def classify_emails(
+    emails: list[EmailData],
+    model: str,
+    batch_size: int = 5,
+    progress_callback: Any = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache: ClassificationCache | None = None,
+    keep_alive: str = KEEP_ALIVE,
+    rules: list[tuple[re.Pattern[str], Category]] | None = None,
+) -> list[dict[str, Any]]:
+    """Classify a list of emails using Ollama."""
+    return asyncio.run(classify_emails_async(
+        emails,
+        model,
+        batch_size,
+        progress_callback,
+        concurrency=concurrency,
+        cache=cache,
+        keep_alive=keep_alive,
+        rules=rules,
+    ))
+
+
+def _summary_bullets(response: Any) -> list[str]:
+    """Normalize an LLM summary response into "• " bullet lines."""
+    summary = response.get("message", {}).get("content", "")
+    bullets: list[str] = []
+    # Ensure bullets are formatted correctly
+    for line in summary.strip().split("\n"):
+        line = line.strip()
+        if line:
+            if not line.startswith(("*", "-", "•")):
+                line = f"• {line}"
+            else:
+                line = f"• {line.lstrip('*-• ')}"
+            bullets.append(line)
+    return bullets
+
+
+async def _agenerate_summaries(
     emails: list[EmailData],
     results: list[dict[str, Any]],
     model: str,
+    keep_alive: str = KEEP_ALIVE,
 ) -> str:
-    """Generate LLM summaries for important categories."""
-    # Group emails by category
-    categories: dict[str, list[EmailData]] = {}
-    email_map = {e.id: e for e in emails}
-
-    for result in results:
-        cat = result.get("category", "FYI")
-        email = email_map.get(result.get("email_id", ""))
-        if email:
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(email)
+    """Generate LLM summaries for important categories concurrently."""
+    # Group emails by category; results are parallel to emails
+    categories: dict[str, list[EmailData]] = defaultdict(list)
+    for email, result in zip(emails, results):
+        categories[result.get("category", "FYI")].append(email)
 
     output_lines: list[str] = []
 
     # Generate summaries for important categories
     important_cats = ["NEEDS_REPLY", "NEEDS_ACTION", "FYI"]
+    tasks = [
+        (cat, categories[cat])
+        for cat in important_cats
+        if categories.get(cat)
+    ]
+
+    async with ollama.AsyncClient() as client:
+        responses = await asyncio.gather(*[
+            client.chat(
+                model=model,
+                messages=_messages(SUMMARY_SYSTEM_PROMPT, build_summary_prompt(cat_emails)),
+                keep_alive=keep_alive,
+            )
+            for _, cat_emails in tasks
+        ], return_exceptions=True)
 
-    for cat in important_cats:
-        if cat not in categories or not categories[cat]:
-            continue
-
-        cat_emails = categories[cat]
+    for (cat, cat_emails), response in zip(tasks, responses):
         count = len(cat_emails)
         display_name = cat.replace("_", " ")
 
         output_lines.append(f"\n{display_name} ({count} email{'s' if count != 1 else ''}):")
 
         try:
-            prompt = build_summary_prompt(cat_emails)
-            response = ollama.chat(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            summary = response.get("message", {}).get("content", "")
-            # Ensure bullets are formatted correctly
-            for line in summary.strip().split("\n"):
-                line = line.strip()
-                if line:
-                    if not line.startswith(("*", "-", "•")):
-                        line = f"• {line}"
-                    else:
-                        line = f"• {line.lstrip('*-• ')}"
-                    output_lines.append(line)
+            if isinstance(response, BaseException):
+                raise response
+            output_lines.extend(_summary_bullets(response))
         except Exception:
             for email in cat_emails:
                 output_lines.append(f"• {email.sender}: {email.subject[:50]}")
@@ -189,3 +505,26 @@ def generate_summaries(
             output_lines.append(f"\n{cat}: {count} email{'s' if count != 1 else ''}")
 
     return "\n".join(output_lines)
+
+
+def generate_summaries(
+    emails: list[EmailData],
+    results: list[dict[str, Any]],
+    model: str,
+    keep_alive: str = KEEP_ALIVE,
+) -> str:
+    """Generate LLM summaries for important categories."""
+    return asyncio.run(_agenerate_summaries(emails, results, model, keep_alive))
+
+
+def _load_model(model: str, keep_alive: str) -> None:
+    """Ask Ollama to load a model, ignoring any errors."""
+    try:
+        ollama.generate(model=model, prompt="", keep_alive=keep_alive)
+    except Exception:
+        pass
+
+
+def warm_up_model(model: str, keep_alive: str = KEEP_ALIVE) -> None:
+    """Start loading a model in the background so the first request is fast."""
+    threading.Thread(target=_load_model, args=(model, keep_alive), daemon=True).start()
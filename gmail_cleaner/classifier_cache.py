@@ -0,0 +1,93 @@
+"""Persistent cache of email classifications for Gmail Cleaner."""
+
+import hashlib
+from pathlib import Path
+
+import orjson
+
+from gmail_cleaner._fileio import atomic_write_bytes
+from gmail_cleaner.config import get_config_dir
+from gmail_cleaner.types import Category, EmailData
+
+
+CACHE_FILE = "classification_cache.json"
+MAX_ENTRIES = 10_000
+
+_CATEGORY_VALUES = frozenset(category.value for category in Category)
+
+
+def get_cache_path() -> Path:
+    """Get path to classification_cache.json."""
+    return get_config_dir() / CACHE_FILE
+
+
+def cache_key(email: EmailData, model: str) -> str:
+    """Build the cache key for an email classified by a given model."""
+    raw = f"{email.sender}\0{email.subject}\0{email.snippet[:200]}\0{model}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+class ClassificationCache:
+    """LRU cache of (category, reason) keyed on sender/subject/snippet/model.
+
+    Lookups and updates are in memory; call save() once per run to persist
+    them.
+    """
+
+    def __init__(self, path: Path | None = None, max_entries: int = MAX_ENTRIES) -> None:
+        self.path = path or get_cache_path()
+        self.max_entries = max_entries
+        self._entries: dict[str, list[str]] = {}
+        self._dirty = False
+
+        try:
+            data = orjson.loads(self.path.read_bytes())
+            if isinstance(data, dict):
+                self._entries = data
+        except (OSError, orjson.JSONDecodeError):
+            pass
+
+    def get(self, email: EmailData, model: str) -> tuple[str, str] | None:
+        """Return the cached (category, reason) for an email, if any.
+
+        Malformed entries (e.g. from a hand-edited file) count as misses and
+        are dropped.
+        """
+        key = cache_key(email, model)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+
+        if not (
+            isinstance(entry, list)
+            and len(entry) == 2
+            and entry[0] in _CATEGORY_VALUES
+            and isinstance(entry[1], str)
+        ):
+            self._dirty = True
+            return None
+
+        # Re-insert so the dict's insertion order tracks recency
+        self._entries[key] = entry
+        self._dirty = True
+        return entry[0], entry[1]
+
+    def put(self, email: EmailData, model: str, category: str, reason: str) -> None:
+        """Store a classification, evicting the least recently used entries."""
+        key = cache_key(email, model)
+        self._entries.pop(key, None)
+        self._entries[key] = [category, reason]
+
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed since it was loaded."""
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.path, orjson.dumps(self._entries))
+        self._dirty = False
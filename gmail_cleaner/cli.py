@@ -1,5 +1,7 @@
 """Interactive CLI for Gmail Cleaner."""
 
+import sys
+import time
 from typing import Any
 
 import questionary
@@ -43,17 +45,58 @@ After saving credentials.json, run this tool again.
 """
 
 
+# How long (seconds) a successful `ollama.list()` result is reused
+MODEL_CACHE_TTL = 60.0
+
+_model_cache: tuple[float, set[str]] | None = None
+
+# Drill-down edit options for an email, keyed by its current category
+_ACTION_CHOICES_BY_CAT: dict[str, list[Choice]] = {
+    cat.value: [
+        Choice(title=f"Change to {c.value}", value=c.value)
+        for c in Category
+        if c != cat
+    ] + [
+        Choice(title="Skip this email", value="skip"),
+        Choice(title="Back", value=None),
+    ]
+    for cat in Category
+}
+
+
 def show_setup_instructions() -> None:
     """Display setup instructions for first-time users."""
     config_dir = get_config_dir()
     print(SETUP_INSTRUCTIONS.format(config_dir=config_dir))
 
 
+def _available_models(refresh: bool = False) -> set[str]:
+    """Return the installed model names, e.g. {"mistral:latest"}.
+
+    Results are cached for MODEL_CACHE_TTL seconds unless `refresh` is set.
+    Raises if Ollama is unreachable; failures are never cached.
+    """
+    global _model_cache
+    now = time.monotonic()
+    if not refresh and _model_cache and now - _model_cache[0] < MODEL_CACHE_TTL:
+        return _model_cache[1]
+
+    import ollama
+    models = ollama.list()
+    names: set[str] = set()
+    for m in models.get("models", []):
+        name = m.get("model") or m.get("name") or ""
+        if name:
+            names.add(name)
+
+    _model_cache = (now, names)
+    return names
+
+
 def check_ollama_status() -> bool:
     """Check if Ollama is running and model is available."""
     try:
-        import ollama
-        ollama.list()
+        _available_models()
         return True
     except Exception:
         return False
@@ -62,7 +105,6 @@ def check_ollama_status() -> bool:
 def prompt_start_ollama() -> bool:
     """Prompt user to start Ollama if not running."""
     import subprocess
-    import time
 
     answer = questionary.confirm(
         "Ollama not running. Start it now?",
@@ -80,13 +122,21 @@ def prompt_start_ollama() -> bool:
     return False
 
 
+def _has_model(model: str, names: set[str]) -> bool:
+    """Whether `model` is among the installed `names`."""
+    # An untagged name means ":latest", as in `ollama run`
+    return model in names or (":" not in model and f"{model}:latest" in names)
+
+
 def check_model_available(model: str) -> bool:
-    """Check if the specified model is available in Ollama."""
+    """Check if the specified model is available in Ollama.
+
+    A miss relists the models, so one pulled since the list was cached is found.
+    """
     try:
-        import ollama
-        models = ollama.list()
-        model_names = [m.get("name", "") for m in models.get("models", [])]
-        return any(model in name or name in model for name in model_names)
+        return _has_model(model, _available_models()) or _has_model(
+            model, _available_models(refresh=True)
+        )
     except Exception:
         return False
 
@@ -226,8 +276,8 @@ def edit_labels(config: Config) -> Config:
 def run_cleaner(config: Config) -> None:
     """Run the email classification and cleanup flow."""
     from gmail_cleaner.pending import pending_exists, load_pending, apply_pending, delete_pending
-    from gmail_cleaner.gmail import fetch_emails, apply_actions
-    from gmail_cleaner.classifier import classify_emails, generate_summaries
+    from gmail_cleaner.gmail import apply_actions
+    from gmail_cleaner.classifier import generate_summaries, warm_up_model
 
     # Check for pending results
     if pending_exists():
@@ -273,16 +323,6 @@ def run_cleaner(config: Config) -> None:
     if not account_name:
         return
 
-    # Run classification flow
-    print(f"\nFetching emails from {config.accounts[account_name].email}...")
-    emails = fetch_emails(config, account_name)
-
-    if not emails:
-        print("No unprocessed emails found.")
-        return
-
-    print(f"Found {len(emails)} emails to process.")
-
     # Check Ollama
     if not check_ollama_status():
         if not prompt_start_ollama():
@@ -293,11 +333,22 @@ def run_cleaner(config: Config) -> None:
         print(f"Model '{config.model}' not found. Install with: ollama pull {config.model}")
         return
 
-    print(f"\nClassifying emails using {config.model}...")
-    results = classify_emails(emails, config.model)
+    # Load the model while emails are being fetched
+    warm_up_model(config.model, config.keep_alive)
+
+    # Run classification flow
+    print(f"\nFetching and classifying emails from "
+          f"{config.accounts[account_name].email} using {config.model}...")
+    emails, results = fetch_and_classify(config, account_name)
+
+    if not emails:
+        print("No unprocessed emails found.")
+        return
+
+    print(f"Processed {len(emails)} emails.")
 
     # Generate and display summaries
-    summaries = generate_summaries(emails, results, config.model)
+    summaries = generate_summaries(emails, results, config.model, config.keep_alive)
     print("\n" + summaries)
 
     # Drill-down option
@@ -322,24 +373,90 @@ def run_cleaner(config: Config) -> None:
         print("Results saved. Use 'Apply pending results' from main menu to apply later.")
 
 
+def fetch_and_classify(
+    config: Config,
+    account_name: str,
+) -> tuple[list[EmailData], list[dict[str, Any]]]:
+    """Fetch and classify emails, classifying each batch while the next loads.
+
+    Returns the emails and their parallel classification results.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from gmail_cleaner.gmail import fetch_emails_stream
+    from gmail_cleaner.classifier import classify_emails, compile_rules
+    from gmail_cleaner.classifier_cache import ClassificationCache
+
+    emails: list[EmailData] = []
+    results: list[dict[str, Any]] = []
+    cache = ClassificationCache()
+    rules = compile_rules(config.rules)
+
+    # One running counter across all batches; run_cleaner reports the final
+    # count, so non-TTY output stays quiet here
+    is_tty = sys.stdout.isatty()
+
+    def show_progress(done: int, _total: int = 0) -> None:
+        if is_tty:
+            sys.stdout.write(f"\rClassifying... [{len(emails) + done}]")
+            sys.stdout.flush()
+
+    stream = fetch_emails_stream(config, account_name)
+    try:
+        with ThreadPoolExecutor(max_workers=1) as fetcher:
+            next_batch = fetcher.submit(next, stream, None)
+            while True:
+                # Only fetch failures are handled here; classification
+                # errors propagate to the caller
+                try:
+                    batch = next_batch.result()
+                except Exception as e:
+                    if is_tty and emails:
+                        print()
+                    print(f"Error fetching emails: {e}")
+                    break
+                if batch is None:
+                    if is_tty and emails:
+                        print()  # Newline after progress
+                    break
+
+                next_batch = fetcher.submit(next, stream, None)
+                results.extend(classify_emails(
+                    batch,
+                    config.model,
+                    cache=cache,
+                    keep_alive=config.keep_alive,
+                    rules=rules,
+                    progress_callback=show_progress,
+                ))
+                emails.extend(batch)
+                show_progress(0)
+    finally:
+        # Persist the cache once per run rather than after every fetched batch
+        cache.save()
+
+    return emails, results
+
+
 def drill_down_menu(
     emails: list[EmailData],
     results: list[dict[str, Any]]
 ) -> list[dict[str, Any]]:
     """Allow user to drill down and edit classifications."""
-    while True:
-        categories: dict[str, list[tuple[EmailData, dict[str, Any]]]] = {}
-        for email, result in zip(emails, results):
-            cat = result.get("category", "FYI")
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append((email, result))
+    categories: dict[str, list[tuple[EmailData, dict[str, Any]]]] = {}
+    for email, result in zip(emails, results):
+        categories.setdefault(result.get("category", "FYI"), []).append((email, result))
 
-        choices = [
-            Choice(title=f"{cat} ({len(items)} emails)", value=cat)
-            for cat, items in categories.items()
-        ]
-        choices.append(Choice(title="Done - continue", value=None))
+    # Menu choices are only rebuilt after an edit changes the categories
+    choices: list[Choice] | None = None
+    email_choices_by_cat: dict[str, list[Choice]] = {}
+
+    while True:
+        if choices is None:
+            choices = [
+                Choice(title=f"{cat} ({len(items)} emails)", value=cat)
+                for cat, items in categories.items()
+            ]
+            choices.append(Choice(title="Done - continue", value=None))
 
         cat_choice = questionary.select(
             "Drill down into category?",
@@ -351,14 +468,17 @@ def drill_down_menu(
 
         # Show emails in category
         cat_emails = categories[cat_choice]
-        email_choices = [
-            Choice(
-                title=f"{e.sender[:30]} - {e.subject[:40]}",
-                value=i
-            )
-            for i, (e, _) in enumerate(cat_emails)
-        ]
-        email_choices.append(Choice(title="Back", value=None))
+        email_choices = email_choices_by_cat.get(cat_choice)
+        if email_choices is None:
+            email_choices = [
+                Choice(
+                    title=f"{e.sender[:30]} - {e.subject[:40]}",
+                    value=i
+                )
+                for i, (e, _) in enumerate(cat_emails)
+            ]
+            email_choices.append(Choice(title="Back", value=None))
+            email_choices_by_cat[cat_choice] = email_choices
 
         email_idx = questionary.select(
             f"Emails in {cat_choice}:",
@@ -370,27 +490,25 @@ def drill_down_menu(
 
         email, result = cat_emails[email_idx]
 
-        # Edit options
-        other_cats = [c.value for c in Category if c.value != cat_choice]
-        action_choices = [
-            Choice(title=f"Change to {c}", value=c)
-            for c in other_cats
-        ]
-        action_choices.extend([
-            Choice(title="Skip this email", value="skip"),
-            Choice(title="Back", value=None),
-        ])
-
         action = questionary.select(
             f"Action for: {email.subject[:50]}",
-            choices=action_choices
+            choices=_ACTION_CHOICES_BY_CAT[cat_choice]
         ).ask()
 
         if action == "skip":
             result["skip"] = True
         elif action and action != "skip":
+            # Move the email between categories instead of regrouping everything
+            del cat_emails[email_idx]
+            if not cat_emails:
+                del categories[cat_choice]
+            categories.setdefault(action, []).append((email, result))
             result["category"] = action
 
+            choices = None
+            email_choices_by_cat.pop(cat_choice, None)
+            email_choices_by_cat.pop(action, None)
+
     return results
 
 
@@ -475,14 +593,7 @@ def main() -> None:
             print("No accounts configured. Run again to add an account.")
             return
 
-    # Check Ollama
-    if not check_ollama_status():
-        if not prompt_start_ollama():
-            print("Warning: Ollama is not running. Start it before classifying emails.")
-    elif not check_model_available(config.model):
-        print(f"Model '{config.model}' not found. Install with: ollama pull {config.model}")
-
-    # Show main menu
+    # Show main menu; run_cleaner checks Ollama once it's actually needed
     main_menu(config)
 
 
@@ -1,14 +1,19 @@
 """Configuration management for Gmail Cleaner."""
 
-import json
+import hashlib
+import sys
 from pathlib import Path
 from typing import Any
 
+import orjson
+
+from gmail_cleaner._fileio import atomic_write_bytes
 from gmail_cleaner.types import (
     AccountConfig,
     Category,
     Config,
     DEFAULT_LABELS,
+    DEFAULT_RULES,
     TokenData,
 )
 
@@ -42,10 +47,9 @@ def validate_credentials() -> str | None:
         return "credentials.json not found"
 
     try:
-        with open(creds_path) as f:
-            json.load(f)
+        orjson.loads(creds_path.read_bytes())
         return None
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return "credentials.json contains malformed JSON"
 
 
@@ -59,7 +63,9 @@ def _config_to_dict(config: Config) -> dict[str, Any]:
     result: dict[str, Any] = {
         "model": config.model,
         "max_emails_per_run": config.max_emails_per_run,
+        "keep_alive": config.keep_alive,
         "labels": config.labels,
+        "rules": config.rules,
         "accounts": {},
     }
     for name, account in config.accounts.items():
@@ -70,6 +76,11 @@ def _config_to_dict(config: Config) -> dict[str, Any]:
     return result
 
 
+def _config_hash(data: dict[str, Any]) -> bytes:
+    """Hash a config dict independent of key order."""
+    return hashlib.md5(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).digest()
+
+
 def _dict_to_config(data: dict[str, Any]) -> Config:
     """Convert dict from JSON to Config object."""
     accounts: dict[str, AccountConfig] = {}
@@ -88,10 +99,20 @@ def _dict_to_config(data: dict[str, Any]) -> Config:
             token=token_data,
         )
 
+    # Intern category keys so lookups with Category values hit on identity
+    labels = {
+        sys.intern(cat): label
+        for cat, label in data.get("labels", {
+            cat.value: label for cat, label in DEFAULT_LABELS.items()
+        }).items()
+    }
+
     return Config(
         model=data.get("model", "mistral:7b"),
         max_emails_per_run=data.get("max_emails_per_run", 100),
-        labels=data.get("labels", {cat.value: label for cat, label in DEFAULT_LABELS.items()}),
+        keep_alive=data.get("keep_alive", "30m"),
+        labels=labels,
+        rules=data.get("rules", [dict(rule) for rule in DEFAULT_RULES]),
         accounts=accounts,
     )
 
@@ -103,17 +124,29 @@ def load_config() -> Config:
         return get_default_config()
 
     try:
-        with open(config_path) as f:
-            data = json.load(f)
-        return _dict_to_config(data)
-    except (json.JSONDecodeError, KeyError):
+        data = orjson.loads(config_path.read_bytes())
+        config = _dict_to_config(data)
+        config._last_saved_hash = _config_hash(_config_to_dict(config))
+        return config
+    except (orjson.JSONDecodeError, KeyError):
         return get_default_config()
 
 
 def save_config(config: Config) -> None:
-    """Save configuration to file."""
+    """Save configuration to file if it changed since it was loaded or saved.
+
+    The file is indented since users edit it by hand (e.g. to change rules).
+    It is written to a temporary sibling and renamed into place, so a crash
+    mid-write never leaves a truncated config.json behind.
+    """
+    data = _config_to_dict(config)
+    data_hash = _config_hash(data)
+    if data_hash == config._last_saved_hash:
+        return
+
     config_dir = ensure_config_dir()
     config_path = config_dir / CONFIG_FILE
 
-    with open(config_path, "w") as f:
-        json.dump(_config_to_dict(config), f, indent=2)
+    atomic_write_bytes(config_path, orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+    config._last_saved_hash = data_hash
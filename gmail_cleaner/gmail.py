@@ -1,13 +1,26 @@
 """Gmail API integration for Gmail Cleaner."""
 
+import functools
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
+import httplib2  # type: ignore[import-untyped]
+import orjson
+
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp  # type: ignore[import-untyped]
 from google_auth_oauthlib.flow import InstalledAppFlow  # type: ignore[import-untyped]
 from googleapiclient.discovery import build, Resource  # type: ignore[import-untyped]
+from googleapiclient.errors import HttpError  # type: ignore[import-untyped]
 
+from gmail_cleaner._fileio import atomic_write_bytes
+from gmail_cleaner._retry import execute_batch_with_backoff, execute_with_backoff
 from gmail_cleaner.config import get_config_dir
 from gmail_cleaner.types import AccountConfig, Config, EmailData, TokenData
 
@@ -17,6 +30,33 @@ SCOPES = [
     "https://www.googleapis.com/auth/gmail.labels",
 ]
 
+# Maximum number of calls Gmail accepts in one batch HTTP request
+BATCH_SIZE = 100
+
+# Maximum number of message ids users.messages.batchModify accepts
+BATCH_MODIFY_SIZE = 1000
+
+METADATA_HEADERS = ("From", "Subject", "Date")
+
+# Partial-response mask: only the parts of a message fetch_emails_stream reads
+METADATA_FIELDS = "id,threadId,snippet,payload/headers"
+
+# Label name -> ID caches older than this (seconds) are refetched
+LABEL_CACHE_TTL = 24 * 60 * 60
+
+HTTP_TIMEOUT = 30
+
+# httplib2.Http is not thread-safe, so each thread keeps its own
+# keep-alive connection pool and reuses it across service builds
+_http_local = threading.local()
+
+# Credentials per (account email, refresh token), shared by every service
+# built this run; keying on the refresh token means a re-added account never
+# reuses the old grant. The lock keeps concurrent account workers from
+# refreshing the same token
+_creds_cache: dict[tuple[str, str], Credentials] = {}
+_creds_lock = threading.Lock()
+
 
 def get_credentials_path() -> Path:
     """Get path to credentials.json."""
@@ -34,8 +74,11 @@ def authenticate_account() -> AccountConfig | None:
         creds = flow.run_local_server(port=0)
 
         # Get user email
-        service = build("gmail", "v1", credentials=creds)
-        profile = service.users().getProfile(userId="me").execute()
+        service = build(
+            "gmail", "v1", credentials=creds,
+            static_discovery=True, cache_discovery=False,
+        )
+        profile = execute_with_backoff(service.users().getProfile(userId="me"))
         email = profile.get("emailAddress", "unknown@gmail.com")
 
         # Build token data
@@ -55,124 +98,289 @@ def authenticate_account() -> AccountConfig | None:
         return None
 
 
+def get_label_cache_path(account_email: str) -> Path:
+    """Get path to the cached label name -> ID map for an account."""
+    return get_config_dir() / f"labels_{account_email}.json"
+
+
+def _load_label_cache(account_email: str) -> dict[str, str]:
+    """Load an account's cached label IDs, or {} if missing or stale."""
+    cache_path = get_label_cache_path(account_email)
+    try:
+        if time.time() - cache_path.stat().st_mtime > LABEL_CACHE_TTL:
+            return {}
+        data = orjson.loads(cache_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_label_cache(account_email: str, mapping: dict[str, str]) -> None:
+    """Persist an account's label name -> ID map."""
+    cache_path = get_label_cache_path(account_email)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(cache_path, orjson.dumps(mapping))
+    except OSError as e:
+        print(f"Error saving label cache: {e}")
+
+
+def _get_http() -> httplib2.Http:
+    """Return this thread's shared httplib2 connection pool."""
+    http = getattr(_http_local, "http", None)
+    if http is None:
+        http = httplib2.Http(timeout=HTTP_TIMEOUT)
+        _http_local.http = http
+    return http
+
+
+def _parse_expiry(value: str) -> datetime | None:
+    """Parse a stored token expiry into the naive UTC datetime google-auth expects."""
+    try:
+        expiry = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if expiry.tzinfo is not None:
+        expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+    return expiry
+
+
+def _get_credentials(account: AccountConfig) -> Credentials:
+    """Return the account's cached credentials, refreshing them if expired.
+
+    A refreshed access token is written back into `account.token`.
+    """
+    with _creds_lock:
+        key = (account.email, account.token["refresh_token"])
+        creds = _creds_cache.get(key)
+        if creds is None:
+            creds = Credentials(  # type: ignore[no-untyped-call]
+                token=account.token["access_token"],
+                refresh_token=account.token["refresh_token"],
+                token_uri=account.token["token_uri"],
+                client_id=account.token["client_id"],
+                client_secret=account.token["client_secret"],
+                scopes=account.token["scopes"],
+                expiry=_parse_expiry(account.token["expiry"]),
+            )
+            _creds_cache[key] = creds
+
+        if creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+            account.token["access_token"] = creds.token or ""
+            account.token["expiry"] = creds.expiry.isoformat() if creds.expiry else ""
+
+        return creds
+
+
 def get_gmail_service(account: AccountConfig) -> Resource:
     """Get authenticated Gmail API service for an account."""
-    creds = Credentials(  # type: ignore[no-untyped-call]
-        token=account.token["access_token"],
-        refresh_token=account.token["refresh_token"],
-        token_uri=account.token["token_uri"],
-        client_id=account.token["client_id"],
-        client_secret=account.token["client_secret"],
-        scopes=account.token["scopes"],
+    creds = _get_credentials(account)
+    authed = AuthorizedHttp(creds, http=_get_http())
+    return build(
+        "gmail", "v1", http=authed,
+        static_discovery=True, cache_discovery=False,
     )
 
-    if creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-
-    return build("gmail", "v1", credentials=creds)
-
 
 def build_exclusion_query(labels: dict[str, str]) -> str:
     """Build Gmail query to exclude already-processed emails."""
-    label_names = list(labels.values())
+    return _build_exclusion_query(tuple(sorted(labels.values())))
+
+
+@functools.lru_cache(maxsize=4)
+def _build_exclusion_query(label_names: tuple[str, ...]) -> str:
+    """Build the exclusion query for a sorted tuple of label names."""
     exclusions = " AND ".join([f'NOT label:"{label}"' for label in label_names])
     return f"is:inbox AND {exclusions}"
 
 
-def fetch_emails(config: Config, account_name: str) -> list[EmailData]:
-    """Fetch unprocessed emails from inbox."""
+def _extract_headers(
+    headers: list[dict[str, str]],
+    names: tuple[str, ...],
+) -> dict[str, str]:
+    """Pick the first value of each wanted header, stopping once all are found."""
+    wanted = set(names)
+    found: dict[str, str] = {}
+    for header in headers:
+        name = header.get("name", "")
+        if name in wanted and name not in found:
+            found[name] = header.get("value", "")
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def fetch_emails_stream(config: Config, account_name: str) -> Iterator[list[EmailData]]:
+    """Yield unprocessed inbox emails, one batch request's worth at a time.
+
+    Lets callers start processing the first emails while the next batch is
+    still being fetched. Errors propagate to the caller.
+    """
     account = config.accounts.get(account_name)
     if not account:
-        return []
-
-    try:
-        service = get_gmail_service(account)
-        query = build_exclusion_query(config.labels)
-
-        results = service.users().messages().list(
-            userId="me",
-            q=query,
-            maxResults=config.max_emails_per_run
-        ).execute()
+        return
 
-        messages = results.get("messages", [])
-        emails: list[EmailData] = []
-
-        for msg in messages:
-            msg_data = service.users().messages().get(
+    service = get_gmail_service(account)
+    query = build_exclusion_query(config.labels)
+
+    results = execute_with_backoff(service.users().messages().list(
+        userId="me",
+        q=query,
+        maxResults=config.max_emails_per_run,
+        fields="messages(id,threadId)",
+    ))
+
+    messages = results.get("messages", [])
+
+    # Slots for the current chunk, filled by position as callbacks arrive
+    emails: list[EmailData | None] = []
+    positions: dict[str, int] = {}
+
+    def on_message(
+        request_id: str,
+        msg_data: dict[str, Any],
+        exception: Exception | None,
+    ) -> None:
+        if exception is not None:
+            print(f"Error fetching email {request_id}: {exception}")
+            return
+
+        headers = _extract_headers(
+            msg_data.get("payload", {}).get("headers", []),
+            METADATA_HEADERS,
+        )
+        emails[positions[request_id]] = EmailData(
+            id=request_id,
+            thread_id=msg_data.get("threadId", ""),
+            sender=headers.get("From", "Unknown"),
+            subject=headers.get("Subject", "(no subject)"),
+            snippet=msg_data.get("snippet", "")[:200],
+            date=headers.get("Date", ""),
+        )
+
+    # Fetch metadata BATCH_SIZE messages per HTTP round-trip
+    for start in range(0, len(messages), BATCH_SIZE):
+        chunk = messages[start:start + BATCH_SIZE]
+        emails = [None] * len(chunk)
+        positions = {msg["id"]: i for i, msg in enumerate(chunk)}
+        requests = {
+            msg["id"]: service.users().messages().get(
                 userId="me",
                 id=msg["id"],
                 format="metadata",
-                metadataHeaders=["From", "Subject", "Date"]
-            ).execute()
+                metadataHeaders=list(METADATA_HEADERS),
+                fields=METADATA_FIELDS,
+            )
+            for msg in chunk
+        }
+        execute_batch_with_backoff(service, requests, on_message, BATCH_SIZE)
 
-            headers = {
-                h["name"]: h["value"]
-                for h in msg_data.get("payload", {}).get("headers", [])
-            }
+        # Failed fetches leave their slot empty
+        yield [email for email in emails if email is not None]
 
-            emails.append(EmailData(
-                id=msg["id"],
-                thread_id=msg.get("threadId", ""),
-                sender=headers.get("From", "Unknown"),
-                subject=headers.get("Subject", "(no subject)"),
-                snippet=msg_data.get("snippet", "")[:200],
-                date=headers.get("Date", ""),
-            ))
-
-        return emails
-    except Exception as e:
-        print(f"Error fetching emails: {e}")
-        return []
 
+def fetch_label_map(service: Resource) -> dict[str, str]:
+    """Fetch all of an account's labels as a name -> ID map."""
+    results = execute_with_backoff(service.users().labels().list(userId="me"))
+    return {label["name"]: str(label["id"]) for label in results.get("labels", [])}
 
-def ensure_label_exists(service: Resource, label_name: str) -> str:
-    """Ensure a label exists and return its ID."""
+
+def _create_label(service: Resource, label_name: str) -> str:
+    """Create a label and return its ID, or "" on failure."""
+    label_body = {
+        "name": label_name,
+        "labelListVisibility": "labelShow",
+        "messageListVisibility": "show",
+    }
     try:
-        # List existing labels
-        results = service.users().labels().list(userId="me").execute()
-        labels = results.get("labels", [])
-
-        for label in labels:
-            if label.get("name") == label_name:
-                return str(label["id"])
-
-        # Create label if it doesn't exist
-        label_body = {
-            "name": label_name,
-            "labelListVisibility": "labelShow",
-            "messageListVisibility": "show",
-        }
-        result = service.users().labels().create(userId="me", body=label_body).execute()
+        result = execute_with_backoff(
+            service.users().labels().create(userId="me", body=label_body)
+        )
         return str(result["id"])
     except Exception as e:
         print(f"Error creating label {label_name}: {e}")
         return ""
 
 
-def apply_label_and_archive(
+def _resolve_label_ids(
     service: Resource,
-    email_id: str,
-    label_id: str,
-    should_archive: bool
-) -> bool:
-    """Apply label to email and optionally archive it."""
+    labels: dict[str, str],
+    label_cache: dict[str, str],
+) -> dict[str, str]:
+    """Map categories to label IDs, creating any labels that don't exist.
+
+    Labels missing from `label_cache` are looked up with one labels.list
+    call and added to it.
+    """
+    label_ids: dict[str, str] = {
+        cat: label_cache[label_name]
+        for cat, label_name in labels.items()
+        if label_name in label_cache
+    }
+    if len(label_ids) == len(labels):
+        return label_ids
+
     try:
-        modify_body: dict[str, Any] = {
-            "addLabelIds": [label_id],
-        }
-        if should_archive:
-            modify_body["removeLabelIds"] = ["INBOX"]
-
-        service.users().messages().modify(
-            userId="me",
-            id=email_id,
-            body=modify_body
-        ).execute()
-        return True
+        existing = fetch_label_map(service)
     except Exception as e:
-        print(f"Error modifying email {email_id}: {e}")
-        return False
+        print(f"Error listing labels: {e}")
+        existing = {}
+
+    for cat, label_name in labels.items():
+        if cat in label_ids:
+            continue
+        label_id = existing.get(label_name) or _create_label(service, label_name)
+        if label_id:
+            label_ids[cat] = label_id
+            label_cache[label_name] = label_id
+
+    return label_ids
+
+
+def _relist_label_ids(
+    service: Resource,
+    config: Config,
+    account_email: str,
+    stale_ids: dict[str, str],
+) -> dict[str, str]:
+    """Re-resolve label IDs bypassing the cache; map each stale ID to its fresh one."""
+    label_cache: dict[str, str] = {}
+    fresh_ids = _resolve_label_ids(service, config.labels, label_cache)
+    _save_label_cache(account_email, label_cache)
+    return {
+        stale_ids[cat]: fresh_ids[cat]
+        for cat in stale_ids
+        if cat in fresh_ids
+    }
+
+
+def _modify_body(label_id: str, should_archive: bool) -> dict[str, Any]:
+    """Build a messages.modify body that labels and optionally archives."""
+    modify_body: dict[str, Any] = {
+        "addLabelIds": [label_id],
+    }
+    if should_archive:
+        modify_body["removeLabelIds"] = ["INBOX"]
+    return modify_body
+
+
+def _is_label_error(error: HttpError) -> bool:
+    """Whether a batchModify failure was caused by an unknown label ID."""
+    content: bytes = error.content or b""
+    return bool(error.resp.status == 400 and b"label" in content.lower())
+
+
+def _batch_modify(
+    service: Resource,
+    email_ids: list[str],
+    label_id: str,
+    should_archive: bool,
+) -> None:
+    """Label and optionally archive up to BATCH_MODIFY_SIZE emails in one call."""
+    body = _modify_body(label_id, should_archive)
+    body["ids"] = email_ids
+    execute_with_backoff(service.users().messages().batchModify(userId="me", body=body))
 
 
 def apply_actions(
@@ -187,14 +395,15 @@ def apply_actions(
 
     service = get_gmail_service(account)
 
-    # Ensure all labels exist
-    label_ids: dict[str, str] = {}
-    for cat, label_name in config.labels.items():
-        label_id = ensure_label_exists(service, label_name)
-        if label_id:
-            label_ids[cat] = label_id
+    # Resolve label IDs from the cache, listing labels once on a miss
+    label_cache = _load_label_cache(account.email)
+    cache_size = len(label_cache)
+    label_ids = _resolve_label_ids(service, config.labels, label_cache)
+    if len(label_cache) != cache_size:
+        _save_label_cache(account.email, label_cache)
 
-    applied_count = 0
+    # Emails sharing a label and archive flag can be modified in one call
+    groups: dict[tuple[str, bool], list[str]] = defaultdict(list)
     for result in results:
         if result.get("skip", False):
             continue
@@ -207,7 +416,31 @@ def apply_actions(
             continue
 
         should_archive = category in ("ARCHIVE", "IGNORE")
-        if apply_label_and_archive(service, email_id, label_id, should_archive):
-            applied_count += 1
+        groups[(label_id, should_archive)].append(email_id)
+
+    applied_count = 0
+    # Cached label ID -> freshly listed ID, filled if the cache proves stale
+    remap: dict[str, str] = {}
+    relisted = False
+    for (label_id, should_archive), email_ids in groups.items():
+        for start in range(0, len(email_ids), BATCH_MODIFY_SIZE):
+            chunk = email_ids[start:start + BATCH_MODIFY_SIZE]
+            while True:
+                try:
+                    _batch_modify(
+                        service, chunk, remap.get(label_id, label_id), should_archive
+                    )
+                    applied_count += len(chunk)
+                except HttpError as e:
+                    # A label may have been deleted since it was cached; relist
+                    # the labels and retry the chunk once
+                    if _is_label_error(e) and not relisted:
+                        relisted = True
+                        remap = _relist_label_ids(service, config, account.email, label_ids)
+                        continue
+                    print(f"Error modifying {len(chunk)} emails: {e}")
+                except Exception as e:
+                    print(f"Error modifying {len(chunk)} emails: {e}")
+                break
 
     return applied_count
@@ -1,86 +1,182 @@
 """Pending results management for Gmail Cleaner."""
 
-import json
+import functools
+import gzip
+import mmap
+import os
+import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
+import orjson
+
+from gmail_cleaner._fileio import atomic_write_bytes
 from gmail_cleaner.config import get_config_dir
 from gmail_cleaner.types import Category, Config, EmailData, PendingEmail, PendingResults
 
 
 PENDING_FILE = "pending.json"
 
+# Payloads larger than this (bytes) are gzip-compressed on save
+COMPRESS_THRESHOLD = 64 * 1024
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Maximum number of accounts applied concurrently
+MAX_ACCOUNT_WORKERS = 4
+
+# Unknown categories in pending.json fall back to FYI
+_CATEGORY_BY_VALUE = {category.value: category for category in Category}
+
+# Fields of a pending.json entry, in PendingEmail's positional order
+_PENDING_FIELDS = itemgetter("account", "email_id", "category", "skip", "subject", "sender")
+
+# Last load_pending result, keyed by the file's (path, mtime, size)
+_CACHE: tuple[tuple[Path, int, int], PendingResults] | None = None
 
+
+def _to_category(value: Any) -> Category:
+    """Map a stored category value to a Category, defaulting to FYI."""
+    if not isinstance(value, str):
+        return Category.FYI
+    return _CATEGORY_BY_VALUE.get(value, Category.FYI)
+
+
+@functools.cache
 def get_pending_path() -> Path:
-    """Get path to pending.json file."""
+    """Get path to pending.json file (resolved once per process)."""
     return get_config_dir() / PENDING_FILE
 
 
 def pending_exists() -> bool:
     """Check if pending.json exists."""
-    return get_pending_path().exists()
+    try:
+        os.stat(get_pending_path())
+    except FileNotFoundError:
+        return False
+    return True
 
 
-def save_pending(
+def _encode_pending(data: dict[str, Any]) -> bytes:
+    """Serialize pending data, compressing it once it gets large."""
+    buf = orjson.dumps(data)
+    if len(buf) > COMPRESS_THRESHOLD:
+        return gzip.compress(buf, compresslevel=6)
+    return buf
+
+
+def _decode_pending(buf: memoryview) -> bytes | memoryview:
+    """Undo _encode_pending's compression; plain JSON passes through."""
+    if buf[:2] == _GZIP_MAGIC:
+        return gzip.decompress(buf)
+    return buf
+
+
+def _build_pending_payload(
     account_name: str,
     emails: list[EmailData],
     results: list[dict[str, Any]],
-) -> None:
-    """Save classification results to pending.json."""
-    email_map = {e.id: e for e in emails}
-
-    pending_emails: list[dict[str, Any]] = []
-    for result in results:
-        email_id = result.get("email_id", "")
-        email = email_map.get(email_id)
-        if email:
-            pending_emails.append({
-                "account": account_name,
-                "email_id": email_id,
-                "category": result.get("category", "FYI"),
-                "skip": result.get("skip", False),
-                "subject": email.subject,
-                "sender": email.sender,
-            })
-
-    data = {
+) -> dict[str, Any]:
+    """Assemble the pending.json document for an account's classified emails."""
+    pending_emails = [
+        PendingEmail(
+            account_name,
+            email.id,
+            _to_category(result.get("category")),
+            result.get("skip", False),
+            email.subject,
+            email.sender,
+        )
+        for email, result in zip(emails, results)
+    ]
+
+    return {
         "created_at": datetime.now().isoformat(),
         "results": pending_emails,
     }
 
+
+def save_pending(
+    account_name: str,
+    emails: list[EmailData],
+    results: list[dict[str, Any]],
+) -> None:
+    """Save classification results to pending.json.
+
+    `results` must be parallel to `emails`, as returned by classify_emails.
+    """
+    data = _build_pending_payload(account_name, emails, results)
+
+    global _CACHE
+    _CACHE = None
+
     pending_path = get_pending_path()
     pending_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(pending_path, "w") as f:
-        json.dump(data, f, indent=2)
+    atomic_write_bytes(pending_path, _encode_pending(data))
+
+
+def _pending_email_with_defaults(item: dict[str, Any]) -> PendingEmail:
+    """Build a PendingEmail from an entry that may be missing fields."""
+    return PendingEmail(
+        item.get("account", ""),
+        item.get("email_id", ""),
+        _to_category(item.get("category")),
+        item.get("skip", False),
+        item.get("subject", ""),
+        item.get("sender", ""),
+    )
 
 
 def load_pending() -> PendingResults | None:
-    """Load pending results from file."""
+    """Load pending results from file.
+
+    Reloading an unchanged file returns the previously loaded results.
+    """
+    global _CACHE
     pending_path = get_pending_path()
-    if not pending_path.exists():
+    try:
+        st = pending_path.stat()
+    except FileNotFoundError:
+        return None
+
+    key = (pending_path, st.st_mtime_ns, st.st_size)
+    if _CACHE and _CACHE[0] == key:
+        return _CACHE[1]
+
+    # mmap can't map an empty file, and it wouldn't parse anyway
+    if st.st_size == 0:
         return None
 
     try:
-        with open(pending_path) as f:
-            data = json.load(f)
-
-        results: list[PendingEmail] = []
-        for item in data.get("results", []):
-            try:
-                category = Category(item.get("category", "FYI"))
-            except ValueError:
-                category = Category.FYI
-
-            results.append(PendingEmail(
-                account=item.get("account", ""),
-                email_id=item.get("email_id", ""),
-                category=category,
-                skip=item.get("skip", False),
-                subject=item.get("subject", ""),
-                sender=item.get("sender", ""),
-            ))
+        # Parse straight from the page cache instead of copying the file
+        with (
+            open(pending_path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+            memoryview(mm) as view,
+        ):
+            data = orjson.loads(_decode_pending(view))
+
+        items = data.get("results", [])
+        try:
+            results = [
+                PendingEmail(
+                    account,
+                    email_id,
+                    _to_category(category),
+                    skip,
+                    subject,
+                    sender,
+                )
+                for account, email_id, category, skip, subject, sender
+                in map(_PENDING_FIELDS, items)
+            ]
+        except KeyError:
+            # Entries missing fields fall back to defaults
+            results = [_pending_email_with_defaults(item) for item in items]
 
         created_at_str = data.get("created_at", "")
         try:
@@ -88,38 +184,51 @@ def load_pending() -> PendingResults | None:
         except ValueError:
             created_at = datetime.now()
 
-        return PendingResults(created_at=created_at, results=results)
-    except (json.JSONDecodeError, KeyError):
+        pending = PendingResults(created_at=created_at, results=results)
+    except (orjson.JSONDecodeError, KeyError, OSError, EOFError, zlib.error):
         return None
 
+    _CACHE = (key, pending)
+    return pending
+
 
 def delete_pending() -> None:
     """Delete pending.json file."""
-    pending_path = get_pending_path()
-    if pending_path.exists():
-        pending_path.unlink()
+    global _CACHE
+    _CACHE = None
+
+    get_pending_path().unlink(missing_ok=True)
 
 
 def apply_pending(pending: PendingResults, config: Config) -> int:
     """Apply pending results to Gmail. Returns count of applied emails."""
     from gmail_cleaner.gmail import apply_actions
 
-    # Group by account
-    accounts: dict[str, list[dict[str, Any]]] = {}
+    # Group by account; apply_actions does its own grouping by label
+    accounts: dict[str, list[dict[str, Any]]] = defaultdict(list)
     for result in pending.results:
-        if result.account not in accounts:
-            accounts[result.account] = []
         accounts[result.account].append({
             "email_id": result.email_id,
             "category": result.category.value,
             "skip": result.skip,
         })
 
+    # Accounts are independent mailboxes, so apply them in parallel, starting
+    # with the largest so it isn't left running alone at the end
+    names = sorted(
+        (name for name in accounts if name in config.accounts),
+        key=lambda name: len(accounts[name]),
+        reverse=True,
+    )
+
     total_applied = 0
-    for account_name, results in accounts.items():
-        if account_name in config.accounts:
-            applied = apply_actions(config, account_name, results)
-            total_applied += applied
+    if names:
+        with ThreadPoolExecutor(max_workers=min(MAX_ACCOUNT_WORKERS, len(names))) as executor:
+            futures = [
+                executor.submit(apply_actions, config, name, accounts[name])
+                for name in names
+            ]
+            total_applied = sum(f.result() for f in as_completed(futures))
 
     # Delete pending file after successful apply
     delete_pending()
@@ -24,6 +24,13 @@ DEFAULT_LABELS: dict[Category, str] = {
     Category.IGNORE: "Auto/Ignore",
 }
 
+# Sender/subject regex rules that classify an email without asking the LLM.
+# The first matching rule wins; set "rules" to [] in config.json to disable.
+DEFAULT_RULES: list[dict[str, str]] = [
+    {"pattern": "noreply|no-reply|donotreply", "category": Category.ARCHIVE.value},
+    {"pattern": "unsubscribe|mailchimp|constantcontact", "category": Category.IGNORE.value},
+]
+
 
 class TokenData(TypedDict):
     """OAuth token data structure."""
@@ -37,7 +44,7 @@ class TokenData(TypedDict):
     expiry: str
 
 
-@dataclass
+@dataclass(slots=True)
 class AccountConfig:
     """Configuration for a single Gmail account."""
 
@@ -45,19 +52,27 @@ class AccountConfig:
     token: TokenData
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Main configuration structure."""
 
     model: str = "mistral:7b"
     max_emails_per_run: int = 100
+    keep_alive: str = "30m"
     labels: dict[str, str] = field(default_factory=lambda: {
         cat.value: label for cat, label in DEFAULT_LABELS.items()
     })
+    rules: list[dict[str, str]] = field(default_factory=lambda: [
+        dict(rule) for rule in DEFAULT_RULES
+    ])
     accounts: dict[str, AccountConfig] = field(default_factory=dict)
+    # Hash of the config as last loaded/saved, used to skip no-op saves
+    _last_saved_hash: bytes | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailData:
     """Email data fetched from Gmail."""
 
@@ -69,7 +84,7 @@ class EmailData:
     date: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassificationResult:
     """Result of classifying an email."""
 
@@ -78,7 +93,7 @@ class ClassificationResult:
     reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingEmail:
     """Email pending action in pending.json."""
 
@@ -90,7 +105,7 @@ class PendingEmail:
     sender: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingResults:
     """Pending classification results."""
 
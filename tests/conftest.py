@@ -0,0 +1,36 @@
+"""Shared test helpers for Gmail Cleaner."""
+
+from unittest.mock import MagicMock
+
+from gmail_cleaner.types import AccountConfig, Config, TokenData
+
+
+def async_client(mock_ollama: MagicMock) -> MagicMock:
+    """The client bound by `async with ollama.AsyncClient() as client`."""
+    client: MagicMock = mock_ollama.AsyncClient.return_value.__aenter__.return_value
+    return client
+
+
+def make_token() -> TokenData:
+    """Placeholder OAuth token data for a test account."""
+    return {
+        "access_token": "test",
+        "refresh_token": "test",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "client_id": "test",
+        "client_secret": "test",
+        "scopes": [],
+        "expiry": "2026-01-01T00:00:00Z",
+    }
+
+
+def make_config(**emails: str) -> Config:
+    """Config with one account per nickname=email, using the default labels.
+
+    Defaults to a single "personal" account for me@gmail.com.
+    """
+    emails = emails or {"personal": "me@gmail.com"}
+    return Config(accounts={
+        name: AccountConfig(email=email, token=make_token())
+        for name, email in emails.items()
+    })
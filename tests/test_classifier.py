@@ -1,19 +1,24 @@
 """Tests for classifier module."""
 
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from typing import Any
 
 import pytest
 
 from gmail_cleaner.classifier import (
+    SYSTEM_PROMPT,
     classify_single_email,
     classify_emails,
     generate_summaries,
     parse_classification_response,
     build_classification_prompt,
+    build_batch_classification_prompt,
     build_summary_prompt,
+    compile_rules,
+    parse_batch_classification_response,
 )
 from gmail_cleaner.types import EmailData, Category
+from tests.conftest import async_client
 
 
 @pytest.fixture
@@ -65,16 +70,31 @@ class TestBuildPrompt:
         assert "are you free" in prompt
         assert "2026-02-03" in prompt
 
-    def test_build_classification_prompt_includes_categories(
-        self, sample_email: EmailData
+    def test_system_prompt_includes_categories(self) -> None:
+        """SYSTEM_PROMPT includes all category options."""
+        assert "NEEDS_REPLY" in SYSTEM_PROMPT
+        assert "NEEDS_ACTION" in SYSTEM_PROMPT
+        assert "FYI" in SYSTEM_PROMPT
+        assert "ARCHIVE" in SYSTEM_PROMPT
+        assert "IGNORE" in SYSTEM_PROMPT
+
+    def test_build_batch_classification_prompt_numbers_each_email(
+        self, sample_emails: list[EmailData]
     ) -> None:
-        """build_classification_prompt includes all category options."""
-        prompt = build_classification_prompt(sample_email)
-        assert "NEEDS_REPLY" in prompt
-        assert "NEEDS_ACTION" in prompt
-        assert "FYI" in prompt
-        assert "ARCHIVE" in prompt
-        assert "IGNORE" in prompt
+        """build_batch_classification_prompt enumerates every email in the batch."""
+        prompt = build_batch_classification_prompt(sample_emails)
+        assert "[1] From: john@example.com" in prompt
+        assert "[2] From: newsletter@company.com" in prompt
+        assert "Weekly Newsletter" in prompt
+
+    def test_build_summary_prompt_lists_each_email(
+        self, sample_emails: list[EmailData]
+    ) -> None:
+        """build_summary_prompt includes one line per email."""
+        prompt = build_summary_prompt(sample_emails)
+        assert "- From: john@example.com, Subject: Meeting Thursday?" in prompt
+        assert "- From: newsletter@company.com, Subject: Weekly Newsletter" in prompt
+        assert "{emails}" not in prompt
 
 
 class TestParseResponse:
@@ -87,6 +107,13 @@ class TestParseResponse:
         assert category == Category.NEEDS_REPLY
         assert reason == "Requires response"
 
+    def test_parse_json_surrounded_by_text(self) -> None:
+        """parse_classification_response extracts JSON wrapped in extra text."""
+        response = 'Sure!\n{"category": "ARCHIVE", "reason": "Newsletter"}\nHope that helps.'
+        category, reason = parse_classification_response(response)
+        assert category == Category.ARCHIVE
+        assert reason == "Newsletter"
+
     def test_parse_invalid_json_defaults_to_fyi(self) -> None:
         """parse_classification_response returns FYI for invalid JSON."""
         response = "not valid json"
@@ -100,6 +127,34 @@ class TestParseResponse:
         category, reason = parse_classification_response(response)
         assert category == Category.FYI
 
+    def test_parse_batch_response_aligns_ids_to_emails(
+        self, sample_emails: list[EmailData]
+    ) -> None:
+        """parse_batch_classification_response maps result ids back to emails."""
+        response = (
+            '{"results": [{"id": 2, "category": "ARCHIVE", "reason": "news"},'
+            ' {"id": 1, "category": "NEEDS_REPLY", "reason": "question"}]}'
+        )
+        results = parse_batch_classification_response(response, sample_emails)
+        assert results is not None
+        assert results[0]["email_id"] == "abc123"
+        assert results[0]["category"] == "NEEDS_REPLY"
+        assert results[1]["email_id"] == "def456"
+        assert results[1]["category"] == "ARCHIVE"
+
+    def test_parse_batch_response_returns_none_on_length_mismatch(
+        self, sample_emails: list[EmailData]
+    ) -> None:
+        """parse_batch_classification_response returns None if an email is missing."""
+        response = '{"results": [{"id": 1, "category": "FYI", "reason": "test"}]}'
+        assert parse_batch_classification_response(response, sample_emails) is None
+
+    def test_parse_batch_response_returns_none_for_invalid_json(
+        self, sample_emails: list[EmailData]
+    ) -> None:
+        """parse_batch_classification_response returns None for invalid JSON."""
+        assert parse_batch_classification_response("not json", sample_emails) is None
+
 
 class TestClassifyEmails:
     """Tests for email classification."""
@@ -120,14 +175,43 @@ class TestClassifyEmails:
         assert call_args.kwargs["model"] == "mistral:7b"
         assert "Meeting Thursday?" in str(call_args.kwargs["messages"])
 
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_single_email_sends_static_system_prompt(
+        self, mock_ollama: MagicMock, sample_email: EmailData
+    ) -> None:
+        """classify_single_email puts the rubric in a fixed system message."""
+        mock_ollama.chat.return_value = {
+            "message": {"content": '{"category": "NEEDS_REPLY", "reason": "test"}'}
+        }
+
+        classify_single_email(sample_email, "mistral:7b")
+
+        messages = mock_ollama.chat.call_args.kwargs["messages"]
+        assert messages[0] == {"role": "system", "content": SYSTEM_PROMPT}
+        assert messages[1]["role"] == "user"
+        assert "Meeting Thursday?" not in SYSTEM_PROMPT
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_single_email_passes_keep_alive(
+        self, mock_ollama: MagicMock, sample_email: EmailData
+    ) -> None:
+        """classify_single_email asks Ollama to keep the model loaded."""
+        mock_ollama.chat.return_value = {
+            "message": {"content": '{"category": "FYI", "reason": "test"}'}
+        }
+
+        classify_single_email(sample_email, "mistral:7b", keep_alive="1h")
+
+        assert mock_ollama.chat.call_args.kwargs["keep_alive"] == "1h"
+
     @patch("gmail_cleaner.classifier.ollama")
     def test_classify_emails_returns_results_for_all(
         self, mock_ollama: MagicMock, sample_emails: list[EmailData]
     ) -> None:
         """classify_emails returns classification for each email."""
-        mock_ollama.chat.return_value = {
+        async_client(mock_ollama).chat = AsyncMock(return_value={
             "message": {"content": '{"category": "FYI", "reason": "test"}'}
-        }
+        })
 
         results = classify_emails(sample_emails, "mistral:7b")
 
@@ -136,12 +220,126 @@ class TestClassifyEmails:
             assert "email_id" in result
             assert "category" in result
 
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_emails_preserves_input_order(
+        self, mock_ollama: MagicMock, sample_emails: list[EmailData]
+    ) -> None:
+        """classify_emails returns results in the same order as the input."""
+        async_client(mock_ollama).chat = AsyncMock(return_value={
+            "message": {"content": '{"category": "FYI", "reason": "test"}'}
+        })
+
+        results = classify_emails(sample_emails, "mistral:7b", batch_size=1)
+
+        assert [r["email_id"] for r in results] == [e.id for e in sample_emails]
+        assert async_client(mock_ollama).chat.await_count == len(sample_emails)
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_emails_closes_client(
+        self, mock_ollama: MagicMock, sample_emails: list[EmailData]
+    ) -> None:
+        """classify_emails closes its Ollama client before returning."""
+        async_client(mock_ollama).chat = AsyncMock(return_value={
+            "message": {"content": '{"category": "FYI", "reason": "test"}'}
+        })
+
+        classify_emails(sample_emails, "mistral:7b")
+
+        mock_ollama.AsyncClient.return_value.__aexit__.assert_awaited_once()
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_emails_reports_progress_per_batch(
+        self, mock_ollama: MagicMock, sample_emails: list[EmailData]
+    ) -> None:
+        """classify_emails calls progress_callback as each batch completes."""
+        async_client(mock_ollama).chat = AsyncMock(return_value={
+            "message": {"content": '{"category": "FYI", "reason": "test"}'}
+        })
+        progress = MagicMock()
+
+        classify_emails(sample_emails, "mistral:7b", batch_size=1, progress_callback=progress)
+
+        assert [c.args for c in progress.call_args_list] == [(1, 2), (2, 2)]
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_emails_sends_one_request_per_batch(
+        self, mock_ollama: MagicMock, sample_emails: list[EmailData]
+    ) -> None:
+        """classify_emails classifies a whole batch with a single request."""
+        async_client(mock_ollama).chat = AsyncMock(return_value={
+            "message": {"content": (
+                '{"results": [{"id": 1, "category": "NEEDS_REPLY", "reason": "a"},'
+                ' {"id": 2, "category": "ARCHIVE", "reason": "b"}]}'
+            )}
+        })
+
+        results = classify_emails(sample_emails, "mistral:7b", batch_size=10)
+
+        assert async_client(mock_ollama).chat.await_count == 1
+        assert [r["category"] for r in results] == ["NEEDS_REPLY", "ARCHIVE"]
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_emails_applies_rules_without_llm(
+        self, mock_ollama: MagicMock
+    ) -> None:
+        """classify_emails classifies rule-matched emails without calling Ollama."""
+        async_client(mock_ollama).chat = AsyncMock()
+        email = EmailData(
+            id="xyz789",
+            thread_id="thread789",
+            sender="noreply@service.com",
+            subject="Your receipt",
+            snippet="Thanks for your order",
+            date="2026-02-03",
+        )
+
+        results = classify_emails([email], "mistral:7b")
+
+        async_client(mock_ollama).chat.assert_not_awaited()
+        assert results[0]["category"] == "ARCHIVE"
+        assert results[0]["reason"].startswith("rule:")
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_emails_with_rules_disabled_uses_llm(
+        self, mock_ollama: MagicMock
+    ) -> None:
+        """classify_emails sends rule-matching emails to Ollama when rules=[]."""
+        async_client(mock_ollama).chat = AsyncMock(return_value={
+            "message": {"content": '{"category": "NEEDS_ACTION", "reason": "security alert"}'}
+        })
+        email = EmailData(
+            id="xyz789",
+            thread_id="thread789",
+            sender="no-reply@accounts.google.com",
+            subject="Security alert",
+            snippet="New sign-in on your account",
+            date="2026-02-03",
+        )
+
+        results = classify_emails([email], "mistral:7b", rules=[])
+
+        async_client(mock_ollama).chat.assert_awaited_once()
+        assert results[0]["category"] == "NEEDS_ACTION"
+
+    def test_compile_rules_skips_invalid_rules(self) -> None:
+        """compile_rules drops rules with a bad pattern or unknown category."""
+        rules = compile_rules([
+            {"pattern": "alerts@", "category": "IGNORE"},
+            {"pattern": "(", "category": "ARCHIVE"},
+            {"pattern": "news@", "category": "Later"},
+            {"pattern": "x"},
+        ])
+
+        assert [(p.pattern, c) for p, c in rules] == [("alerts@", Category.IGNORE)]
+
     @patch("gmail_cleaner.classifier.ollama")
     def test_classify_emails_handles_ollama_error(
         self, mock_ollama: MagicMock, sample_emails: list[EmailData]
     ) -> None:
         """classify_emails handles Ollama errors gracefully."""
-        mock_ollama.chat.side_effect = Exception("Connection error")
+        async_client(mock_ollama).chat = AsyncMock(
+            side_effect=Exception("Connection error")
+        )
 
         results = classify_emails(sample_emails, "mistral:7b")
 
@@ -159,9 +357,9 @@ class TestGenerateSummaries:
         self, mock_ollama: MagicMock, sample_emails: list[EmailData]
     ) -> None:
         """generate_summaries returns formatted summary string."""
-        mock_ollama.chat.return_value = {
+        async_client(mock_ollama).chat = AsyncMock(return_value={
             "message": {"content": "* Email about meeting\n* Newsletter update"}
-        }
+        })
 
         results = [
             {"email_id": "abc123", "category": "NEEDS_REPLY", "reason": "test"},
@@ -178,9 +376,9 @@ class TestGenerateSummaries:
         self, mock_ollama: MagicMock, sample_emails: list[EmailData]
     ) -> None:
         """generate_summaries shows only counts for ARCHIVE and IGNORE."""
-        mock_ollama.chat.return_value = {
+        async_client(mock_ollama).chat = AsyncMock(return_value={
             "message": {"content": "* Email summary"}
-        }
+        })
 
         results = [
             {"email_id": "abc123", "category": "ARCHIVE", "reason": "test"},
@@ -191,3 +389,23 @@ class TestGenerateSummaries:
 
         assert "ARCHIVE: 1 email" in summary or "ARCHIVE (1" in summary
         assert "IGNORE: 1 email" in summary or "IGNORE (1" in summary
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_generate_summaries_falls_back_per_failed_category(
+        self, mock_ollama: MagicMock, sample_emails: list[EmailData]
+    ) -> None:
+        """generate_summaries lists sender/subject for a category whose call failed."""
+        async_client(mock_ollama).chat = AsyncMock(side_effect=[
+            {"message": {"content": "* Meeting request"}},
+            Exception("Connection error"),
+        ])
+
+        results = [
+            {"email_id": "abc123", "category": "NEEDS_REPLY", "reason": "test"},
+            {"email_id": "def456", "category": "FYI", "reason": "test"},
+        ]
+
+        summary = generate_summaries(sample_emails, results, "mistral:7b")
+
+        assert "• Meeting request" in summary
+        assert "• newsletter@company.com: Weekly Newsletter" in summary
@@ -0,0 +1,123 @@
+"""Tests for classifier_cache module."""
+
+from pathlib import Path
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import orjson
+import pytest
+
+from gmail_cleaner.classifier import classify_emails
+from gmail_cleaner.classifier_cache import ClassificationCache, cache_key
+from gmail_cleaner.types import EmailData
+from tests.conftest import async_client
+
+
+@pytest.fixture
+def sample_email() -> EmailData:
+    """Sample email for testing."""
+    return EmailData(
+        id="abc123",
+        thread_id="thread123",
+        sender="digest@linkedin.com",
+        subject="Your weekly digest",
+        snippet="See who viewed your profile...",
+        date="2026-02-03",
+    )
+
+
+class TestCacheKey:
+    """Tests for cache_key function."""
+
+    def test_cache_key_ignores_email_id(self, sample_email: EmailData) -> None:
+        """cache_key is the same for emails with identical content."""
+        other = EmailData(
+            id="other",
+            thread_id="other",
+            sender=sample_email.sender,
+            subject=sample_email.subject,
+            snippet=sample_email.snippet,
+            date="2026-02-10",
+        )
+        assert cache_key(sample_email, "mistral:7b") == cache_key(other, "mistral:7b")
+
+    def test_cache_key_depends_on_model(self, sample_email: EmailData) -> None:
+        """cache_key differs between models."""
+        assert cache_key(sample_email, "mistral:7b") != cache_key(sample_email, "llama2:7b")
+
+
+class TestClassificationCache:
+    """Tests for ClassificationCache."""
+
+    def test_get_returns_none_on_miss(self, tmp_path: Path, sample_email: EmailData) -> None:
+        """get returns None for an email that was never stored."""
+        cache = ClassificationCache(tmp_path / "cache.json")
+        assert cache.get(sample_email, "mistral:7b") is None
+
+    def test_save_persists_entries(self, tmp_path: Path, sample_email: EmailData) -> None:
+        """Entries written with put survive save and reload."""
+        cache_file = tmp_path / "cache.json"
+        cache = ClassificationCache(cache_file)
+        cache.put(sample_email, "mistral:7b", "ARCHIVE", "Digest")
+        cache.save()
+
+        reloaded = ClassificationCache(cache_file)
+        assert reloaded.get(sample_email, "mistral:7b") == ("ARCHIVE", "Digest")
+
+    def test_get_drops_malformed_entries(self, tmp_path: Path, sample_email: EmailData) -> None:
+        """get treats entries with an unknown category or bad shape as misses."""
+        cache_file = tmp_path / "cache.json"
+        key = cache_key(sample_email, "mistral:7b")
+        for entry in (["Needs reply", "reason"], ["ARCHIVE"], "ARCHIVE"):
+            cache_file.write_bytes(orjson.dumps({key: entry}))
+            cache = ClassificationCache(cache_file)
+            assert cache.get(sample_email, "mistral:7b") is None
+
+            cache.save()
+            assert orjson.loads(cache_file.read_bytes()) == {}
+
+    def test_put_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """put drops the oldest entry once max_entries is exceeded."""
+        cache = ClassificationCache(tmp_path / "cache.json", max_entries=2)
+        emails = [
+            EmailData(id=str(i), thread_id="", sender=f"s{i}", subject="", snippet="", date="")
+            for i in range(3)
+        ]
+        cache.put(emails[0], "m", "FYI", "")
+        cache.put(emails[1], "m", "FYI", "")
+        cache.get(emails[0], "m")
+        cache.put(emails[2], "m", "FYI", "")
+
+        assert cache.get(emails[0], "m") is not None
+        assert cache.get(emails[1], "m") is None
+        assert cache.get(emails[2], "m") is not None
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_emails_skips_llm_for_cached_email(
+        self, mock_ollama: MagicMock, tmp_path: Path, sample_email: EmailData
+    ) -> None:
+        """classify_emails answers cached emails without calling Ollama."""
+        async_client(mock_ollama).chat = AsyncMock()
+        cache = ClassificationCache(tmp_path / "cache.json")
+        cache.put(sample_email, "mistral:7b", "ARCHIVE", "Digest")
+
+        results = classify_emails([sample_email], "mistral:7b", cache=cache)
+
+        async_client(mock_ollama).chat.assert_not_awaited()
+        assert results[0]["email_id"] == "abc123"
+        assert results[0]["category"] == "ARCHIVE"
+
+    @patch("gmail_cleaner.classifier.ollama")
+    def test_classify_emails_leaves_saving_to_caller(
+        self, mock_ollama: MagicMock, tmp_path: Path, sample_email: EmailData
+    ) -> None:
+        """classify_emails adds new results to the cache but doesn't write the file."""
+        async_client(mock_ollama).chat = AsyncMock(return_value={
+            "message": {"content": '{"category": "ARCHIVE", "reason": "Digest"}'}
+        })
+        cache_file = tmp_path / "cache.json"
+        cache = ClassificationCache(cache_file)
+
+        classify_emails([sample_email], "mistral:7b", cache=cache)
+
+        assert not cache_file.exists()
+        assert cache.get(sample_email, "mistral:7b") == ("ARCHIVE", "Digest")
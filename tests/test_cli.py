@@ -0,0 +1,161 @@
+"""Tests for CLI module."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from gmail_cleaner.cli import _available_models, check_model_available, fetch_and_classify
+from gmail_cleaner.types import Config, EmailData
+
+
+@pytest.fixture(autouse=True)
+def _reset_model_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test without a cached model list."""
+    monkeypatch.setattr("gmail_cleaner.cli._model_cache", None)
+
+
+class TestAvailableModels:
+    """Tests for _available_models function."""
+
+    @patch("ollama.list")
+    def test_available_models_returns_installed_names(self, mock_list: MagicMock) -> None:
+        """_available_models reads names from either the model or name key."""
+        mock_list.return_value = {"models": [{"model": "mistral:latest"}, {"name": "llama3:8b"}]}
+
+        assert _available_models() == {"mistral:latest", "llama3:8b"}
+
+    @patch("ollama.list")
+    def test_available_models_caches_list(self, mock_list: MagicMock) -> None:
+        """_available_models asks Ollama only once within the cache TTL."""
+        mock_list.return_value = {"models": [{"model": "mistral:latest"}]}
+
+        _available_models()
+        _available_models()
+
+        assert mock_list.call_count == 1
+
+
+class TestCheckModelAvailable:
+    """Tests for check_model_available function."""
+
+    @patch("ollama.list")
+    def test_check_model_available_matches_exact_tag(self, mock_list: MagicMock) -> None:
+        """check_model_available accepts an installed name:tag."""
+        mock_list.return_value = {"models": [{"model": "mistral:7b"}]}
+
+        assert check_model_available("mistral:7b") is True
+
+    @patch("ollama.list")
+    def test_check_model_available_treats_untagged_as_latest(self, mock_list: MagicMock) -> None:
+        """check_model_available resolves an untagged name to :latest."""
+        mock_list.return_value = {"models": [{"model": "mistral:latest"}]}
+
+        assert check_model_available("mistral") is True
+
+    @patch("ollama.list")
+    def test_check_model_available_rejects_other_tag(self, mock_list: MagicMock) -> None:
+        """check_model_available doesn't accept a different tag of the same model."""
+        mock_list.return_value = {"models": [{"model": "mistral:latest"}]}
+
+        assert check_model_available("mistral:7b") is False
+
+    @patch("ollama.list")
+    def test_check_model_available_relists_on_miss(self, mock_list: MagicMock) -> None:
+        """check_model_available finds a model pulled after the list was cached."""
+        mock_list.return_value = {"models": [{"model": "mistral:latest"}]}
+        _available_models()
+        mock_list.return_value = {"models": [{"model": "mistral:latest"}, {"model": "llama3:8b"}]}
+
+        assert check_model_available("llama3:8b") is True
+        assert mock_list.call_count == 2
+
+    @patch("ollama.list")
+    def test_check_model_available_false_when_ollama_down(self, mock_list: MagicMock) -> None:
+        """check_model_available returns False if Ollama can't be reached."""
+        mock_list.side_effect = ConnectionError("refused")
+
+        assert check_model_available("mistral:7b") is False
+
+
+def make_email(email_id: str) -> EmailData:
+    """Minimal email with the given id."""
+    return EmailData(
+        id=email_id,
+        thread_id=f"t-{email_id}",
+        sender=f"{email_id}@example.com",
+        subject=f"Subject {email_id}",
+        snippet="",
+        date="",
+    )
+
+
+def stub_classify(emails: list[EmailData], *args: Any, **kwargs: Any) -> list[dict[str, Any]]:
+    """Classify every email as FYI."""
+    return [
+        {"email_id": e.id, "category": "FYI", "reason": "stub", "skip": False}
+        for e in emails
+    ]
+
+
+class TestFetchAndClassify:
+    """Tests for fetch_and_classify function."""
+
+    @pytest.fixture(autouse=True)
+    def _cache_path(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Keep the classification cache out of the real config dir."""
+        monkeypatch.setattr(
+            "gmail_cleaner.classifier_cache.get_cache_path",
+            lambda: tmp_path / "classification_cache.json",
+        )
+
+    def test_fetch_and_classify_classifies_every_batch(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """fetch_and_classify returns all streamed emails with parallel results."""
+        batches = [[make_email("a"), make_email("b")], [make_email("c")]]
+        monkeypatch.setattr(
+            "gmail_cleaner.gmail.fetch_emails_stream", lambda config, name: iter(batches)
+        )
+        monkeypatch.setattr("gmail_cleaner.classifier.classify_emails", stub_classify)
+
+        emails, results = fetch_and_classify(Config(), "personal")
+
+        assert [e.id for e in emails] == ["a", "b", "c"]
+        assert [r["email_id"] for r in results] == ["a", "b", "c"]
+
+    def test_fetch_and_classify_keeps_batches_before_fetch_error(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """A failed fetch is reported and the emails classified so far are kept."""
+        def stream(config: Config, name: str) -> Iterator[list[EmailData]]:
+            yield [make_email("a")]
+            raise ConnectionError("network down")
+
+        monkeypatch.setattr("gmail_cleaner.gmail.fetch_emails_stream", stream)
+        monkeypatch.setattr("gmail_cleaner.classifier.classify_emails", stub_classify)
+
+        emails, results = fetch_and_classify(Config(), "personal")
+
+        assert [e.id for e in emails] == ["a"]
+        assert len(results) == 1
+        assert "Error fetching emails: network down" in capsys.readouterr().out
+
+    def test_fetch_and_classify_propagates_classification_errors(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Classification failures aren't reported as fetch errors."""
+        def failing_classify(*args: Any, **kwargs: Any) -> list[dict[str, Any]]:
+            raise TypeError("classifier broke")
+
+        monkeypatch.setattr(
+            "gmail_cleaner.gmail.fetch_emails_stream",
+            lambda config, name: iter([[make_email("a")]]),
+        )
+        monkeypatch.setattr("gmail_cleaner.classifier.classify_emails", failing_classify)
+
+        with pytest.raises(TypeError, match="classifier broke"):
+            fetch_and_classify(Config(), "personal")
+        assert "Error fetching emails" not in capsys.readouterr().out
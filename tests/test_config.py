@@ -124,6 +124,16 @@ class TestConfig:
             assert data["model"] == "test-model"
             assert data["max_emails_per_run"] == 25
 
+    def test_save_config_preserves_rules(self, tmp_path: Path) -> None:
+        """save_config round-trips rules, including an empty list to disable them."""
+        with patch("gmail_cleaner.config.get_config_dir", return_value=tmp_path):
+            save_config(Config(rules=[]))
+            assert load_config().rules == []
+
+            rules = [{"pattern": "alerts@", "category": "IGNORE"}]
+            save_config(Config(rules=rules))
+            assert load_config().rules == rules
+
     def test_save_config_preserves_accounts(self, tmp_path: Path) -> None:
         """save_config preserves account data."""
         with patch("gmail_cleaner.config.get_config_dir", return_value=tmp_path):
@@ -145,3 +155,32 @@ class TestConfig:
             loaded = load_config()
             assert "personal" in loaded.accounts
             assert loaded.accounts["personal"].email == "test@gmail.com"
+
+    def test_save_config_skips_unchanged_config(self, tmp_path: Path) -> None:
+        """save_config doesn't rewrite the file when nothing changed."""
+        with patch("gmail_cleaner.config.get_config_dir", return_value=tmp_path):
+            config = Config(model="test-model")
+            save_config(config)
+
+            config_file = tmp_path / "config.json"
+            config_file.write_text("sentinel")
+            save_config(config)
+            assert config_file.read_text() == "sentinel"
+
+            config.model = "other-model"
+            save_config(config)
+            assert json.loads(config_file.read_text())["model"] == "other-model"
+
+    def test_save_config_leaves_no_temp_files(self, tmp_path: Path) -> None:
+        """save_config replaces config.json without leaving temp files behind."""
+        with patch("gmail_cleaner.config.get_config_dir", return_value=tmp_path):
+            save_config(Config(model="test-model"))
+            assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+    def test_save_config_writes_indented_json(self, tmp_path: Path) -> None:
+        """save_config writes indented JSON so config.json stays hand-editable."""
+        with patch("gmail_cleaner.config.get_config_dir", return_value=tmp_path):
+            save_config(Config(model="test-model"))
+
+            config_file = tmp_path / "config.json"
+            assert '\n  "model": "test-model"' in config_file.read_text()
@@ -0,0 +1,36 @@
+"""Tests for crash-safe file writes."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gmail_cleaner._fileio import atomic_write_bytes
+
+
+class TestAtomicWriteBytes:
+    """Tests for atomic_write_bytes function."""
+
+    def test_atomic_write_bytes_replaces_file(self, tmp_path: Path) -> None:
+        """atomic_write_bytes overwrites the target and leaves no temp files."""
+        target = tmp_path / "state.json"
+        target.write_bytes(b"old")
+
+        atomic_write_bytes(target, b"new")
+
+        assert target.read_bytes() == b"new"
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    def test_atomic_write_bytes_cleans_up_when_write_fails(self, tmp_path: Path) -> None:
+        """A failed write removes the temp file and leaves the target untouched."""
+        target = tmp_path / "state.json"
+        target.write_bytes(b"old")
+
+        with (
+            patch("gmail_cleaner._fileio.os.fsync", side_effect=OSError("disk full")),
+            pytest.raises(OSError),
+        ):
+            atomic_write_bytes(target, b"new")
+
+        assert target.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
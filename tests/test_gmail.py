@@ -0,0 +1,224 @@
+"""Tests for Gmail API integration module."""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch, MagicMock
+
+import httplib2  # type: ignore[import-untyped]
+import orjson
+import pytest
+from googleapiclient.errors import HttpError  # type: ignore[import-untyped]
+
+from gmail_cleaner.gmail import _get_credentials, apply_actions, fetch_emails_stream
+from tests.conftest import make_config
+
+
+def make_fetch_service(count: int, failing: set[str] | None = None) -> tuple[MagicMock, list[int]]:
+    """Mock service listing `count` messages and answering batched metadata gets.
+
+    Batch callbacks fire in reverse order, and ids in `failing` get a 404.
+    Returns the service and the size of each batch request sent.
+    """
+    failing = failing or set()
+    sent: list[int] = []
+
+    def new_batch(callback: Any) -> MagicMock:
+        batch = MagicMock()
+        ids: list[str] = []
+        batch.add.side_effect = lambda req, request_id: ids.append(request_id)
+
+        def execute() -> None:
+            sent.append(len(ids))
+            for request_id in reversed(ids):
+                if request_id in failing:
+                    error = HttpError(httplib2.Response({"status": 404}), b"Not Found")
+                    callback(request_id, None, error)
+                else:
+                    callback(request_id, {
+                        "threadId": f"t-{request_id}",
+                        "snippet": f"snippet {request_id}",
+                        "payload": {"headers": [
+                            {"name": "From", "value": f"{request_id}@example.com"},
+                            {"name": "Subject", "value": f"Subject {request_id}"},
+                        ]},
+                    }, None)
+
+        batch.execute.side_effect = execute
+        return batch
+
+    service = MagicMock()
+    service.users().messages().list().execute.return_value = {
+        "messages": [{"id": f"m{i}", "threadId": f"t-m{i}"} for i in range(count)]
+    }
+    service.new_batch_http_request.side_effect = new_batch
+    return service, sent
+
+
+class TestFetchEmailsStream:
+    """Tests for fetch_emails_stream function."""
+
+    def test_yields_one_list_per_batch_in_list_order(self) -> None:
+        """Metadata gets go out 100 per batch, and each batch is yielded in list order."""
+        config = make_config()
+        config.max_emails_per_run = 250
+        service, sent = make_fetch_service(250)
+
+        with patch("gmail_cleaner.gmail.get_gmail_service", return_value=service):
+            batches = list(fetch_emails_stream(config, "personal"))
+
+        assert sent == [100, 100, 50]
+        assert [len(batch) for batch in batches] == [100, 100, 50]
+        emails = [email for batch in batches for email in batch]
+        assert [email.id for email in emails] == [f"m{i}" for i in range(250)]
+        assert emails[0].sender == "m0@example.com"
+        assert emails[0].subject == "Subject m0"
+        assert emails[0].thread_id == "t-m0"
+        assert emails[0].date == ""
+
+    def test_skips_messages_that_failed_to_fetch(self) -> None:
+        """A message whose metadata get fails is left out of its batch."""
+        service, _ = make_fetch_service(3, failing={"m1"})
+
+        with patch("gmail_cleaner.gmail.get_gmail_service", return_value=service):
+            batches = list(fetch_emails_stream(make_config(), "personal"))
+
+        assert [[email.id for email in batch] for batch in batches] == [["m0", "m2"]]
+
+
+class TestApplyActions:
+    """Tests for apply_actions function."""
+
+    def test_apply_actions_groups_and_chunks_batch_modify_calls(self, tmp_path: Path) -> None:
+        """Emails sharing a label and archive flag go out together, chunked by size."""
+        config = make_config()
+        config.labels = {**config.labels, "ARCHIVE": "Auto/Done", "IGNORE": "Auto/Done"}
+        (tmp_path / "labels_me@gmail.com.json").write_bytes(orjson.dumps({
+            name: f"id-{name}" for name in config.labels.values()
+        }))
+        service = MagicMock()
+        batch_modify = service.users().messages().batchModify
+
+        with (
+            patch("gmail_cleaner.gmail.get_config_dir", return_value=tmp_path),
+            patch("gmail_cleaner.gmail.get_gmail_service", return_value=service),
+            patch("gmail_cleaner.gmail.BATCH_MODIFY_SIZE", 2),
+        ):
+            applied = apply_actions(config, "personal", [
+                {"email_id": "f1", "category": "FYI", "skip": False},
+                {"email_id": "a1", "category": "ARCHIVE", "skip": False},
+                {"email_id": "f2", "category": "FYI", "skip": False},
+                {"email_id": "s1", "category": "FYI", "skip": True},
+                {"email_id": "i1", "category": "IGNORE", "skip": False},
+                {"email_id": "f3", "category": "FYI", "skip": False},
+            ])
+
+        assert applied == 5
+        bodies = [c.kwargs["body"] for c in batch_modify.call_args_list if "body" in c.kwargs]
+        assert bodies == [
+            {"addLabelIds": ["id-Auto/FYI"], "ids": ["f1", "f2"]},
+            {"addLabelIds": ["id-Auto/FYI"], "ids": ["f3"]},
+            {"addLabelIds": ["id-Auto/Done"], "removeLabelIds": ["INBOX"], "ids": ["a1", "i1"]},
+        ]
+
+    def test_apply_actions_relists_labels_when_cached_id_is_stale(self, tmp_path: Path) -> None:
+        """A 400 from batchModify refreshes the label cache and retries the chunk."""
+        config = make_config()
+        (tmp_path / "labels_me@gmail.com.json").write_bytes(
+            orjson.dumps({name: f"stale-{cat}" for cat, name in config.labels.items()})
+        )
+
+        service = MagicMock()
+        service.users().labels().list().execute.return_value = {
+            "labels": [
+                {"name": name, "id": f"fresh-{cat}"} for cat, name in config.labels.items()
+            ]
+        }
+        batch_modify = service.users().messages().batchModify
+        batch_modify.return_value.execute.side_effect = [
+            HttpError(httplib2.Response({"status": 400}), b"Invalid label"),
+            {},
+        ]
+
+        with (
+            patch("gmail_cleaner.gmail.get_config_dir", return_value=tmp_path),
+            patch("gmail_cleaner.gmail.get_gmail_service", return_value=service),
+        ):
+            applied = apply_actions(config, "personal", [
+                {"email_id": "abc123", "category": "FYI", "skip": False},
+            ])
+
+        assert applied == 1
+        assert batch_modify.call_args.kwargs["body"]["addLabelIds"] == ["fresh-FYI"]
+        cached = orjson.loads((tmp_path / "labels_me@gmail.com.json").read_bytes())
+        assert cached["Auto/FYI"] == "fresh-FYI"
+
+    def test_apply_actions_keeps_label_cache_on_other_bad_requests(
+        self, tmp_path: Path
+    ) -> None:
+        """A 400 that isn't about a label doesn't relist or recreate labels."""
+        config = make_config()
+        (tmp_path / "labels_me@gmail.com.json").write_bytes(
+            orjson.dumps({name: f"id-{cat}" for cat, name in config.labels.items()})
+        )
+
+        service = MagicMock()
+        batch_modify = service.users().messages().batchModify
+        batch_modify.return_value.execute.side_effect = HttpError(
+            httplib2.Response({"status": 400}), b"Invalid id value"
+        )
+
+        with (
+            patch("gmail_cleaner.gmail.get_config_dir", return_value=tmp_path),
+            patch("gmail_cleaner.gmail.get_gmail_service", return_value=service),
+        ):
+            applied = apply_actions(config, "personal", [
+                {"email_id": "bogus", "category": "FYI", "skip": False},
+            ])
+
+        assert applied == 0
+        service.users().labels().list.assert_not_called()
+        service.users().labels().create.assert_not_called()
+
+
+class TestGetCredentials:
+    """Tests for _get_credentials function."""
+
+    def test_expired_token_is_refreshed_once_and_written_back(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """An expired stored token is refreshed once and saved into account.token."""
+        monkeypatch.setattr("gmail_cleaner.gmail._creds_cache", {})
+        account = make_config().accounts["personal"]
+
+        def fake_refresh(creds: Any, request: Any) -> None:
+            creds.token = "fresh-token"
+            creds.expiry = datetime(2099, 1, 1)
+
+        with patch(
+            "gmail_cleaner.gmail.Credentials.refresh", autospec=True, side_effect=fake_refresh
+        ) as mock_refresh:
+            first = _get_credentials(account)
+            second = _get_credentials(account)
+
+        assert first is second
+        assert mock_refresh.call_count == 1
+        assert account.token["access_token"] == "fresh-token"
+        assert account.token["expiry"] == "2099-01-01T00:00:00"
+
+    def test_reauthenticated_account_gets_new_credentials(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Re-adding an account with a new refresh token drops the cached credentials."""
+        monkeypatch.setattr("gmail_cleaner.gmail._creds_cache", {})
+        account = make_config().accounts["personal"]
+        account.token["expiry"] = "2099-01-01T00:00:00"
+
+        first = _get_credentials(account)
+        readded = make_config().accounts["personal"]
+        readded.token["refresh_token"] = "new-refresh"
+        readded.token["expiry"] = "2099-01-01T00:00:00"
+        second = _get_credentials(readded)
+
+        assert first is not second
+        assert second.refresh_token == "new-refresh"
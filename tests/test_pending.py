@@ -1,26 +1,52 @@
 """Tests for pending results module."""
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
 
+import orjson
 import pytest
 
 from gmail_cleaner.pending import (
+    _build_pending_payload,
+    apply_pending,
     pending_exists,
     load_pending,
     save_pending,
     delete_pending,
     get_pending_path,
 )
-from gmail_cleaner.types import EmailData, PendingResults, PendingEmail, Category
+from gmail_cleaner.types import (
+    Category,
+    Config,
+    EmailData,
+    PendingEmail,
+    PendingResults,
+)
+from tests.conftest import make_config
+
+
+@pytest.fixture(scope="module")
+def pending_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory shared by every test's pending file."""
+    return tmp_path_factory.mktemp("pending")
 
 
 @pytest.fixture
+def pending_file(pending_dir: Path, request: pytest.FixtureRequest) -> Path:
+    """Pending file for the current test, unique within the shared directory."""
+    return pending_dir / f"{request.node.name}.json"
+
+
+@pytest.fixture(autouse=True)
+def _patch_pending_path(monkeypatch: pytest.MonkeyPatch, pending_file: Path) -> None:
+    """Point the pending module at the test's pending.json."""
+    monkeypatch.setattr("gmail_cleaner.pending.get_pending_path", lambda: pending_file)
+
+
+@pytest.fixture(scope="module")
 def sample_emails() -> list[EmailData]:
-    """Sample emails for testing."""
+    """Sample emails for testing (shared read-only across the module)."""
     return [
         EmailData(
             id="abc123",
@@ -41,9 +67,9 @@ def sample_emails() -> list[EmailData]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_results() -> list[dict[str, Any]]:
-    """Sample classification results."""
+    """Sample classification results (shared read-only across the module)."""
     return [
         {"email_id": "abc123", "category": "NEEDS_REPLY", "reason": "test", "skip": False},
         {"email_id": "def456", "category": "ARCHIVE", "reason": "test", "skip": False},
@@ -53,17 +79,14 @@ def sample_results() -> list[dict[str, Any]]:
 class TestPendingExists:
     """Tests for pending_exists function."""
 
-    def test_pending_exists_returns_false_when_no_file(self, tmp_path: Path) -> None:
+    def test_pending_exists_returns_false_when_no_file(self) -> None:
         """pending_exists returns False when pending.json doesn't exist."""
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=tmp_path / "pending.json"):
-            assert pending_exists() is False
+        assert pending_exists() is False
 
-    def test_pending_exists_returns_true_when_file_exists(self, tmp_path: Path) -> None:
+    def test_pending_exists_returns_true_when_file_exists(self, pending_file: Path) -> None:
         """pending_exists returns True when pending.json exists."""
-        pending_file = tmp_path / "pending.json"
         pending_file.write_text("{}")
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=pending_file):
-            assert pending_exists() is True
+        assert pending_exists() is True
 
 
 class TestSavePending:
@@ -71,56 +94,63 @@ class TestSavePending:
 
     def test_save_pending_creates_file(
         self,
-        tmp_path: Path,
+        pending_file: Path,
         sample_emails: list[EmailData],
         sample_results: list[dict[str, Any]],
     ) -> None:
         """save_pending creates pending.json file."""
-        pending_file = tmp_path / "pending.json"
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=pending_file):
-            save_pending("personal", sample_emails, sample_results)
-            assert pending_file.exists()
+        save_pending("personal", sample_emails, sample_results)
+        data = orjson.loads(pending_file.read_bytes())
+        assert data["results"][0]["email_id"] == "abc123"
+        assert data["results"][0]["category"] == "NEEDS_REPLY"
 
     def test_save_pending_includes_created_at(
         self,
-        tmp_path: Path,
         sample_emails: list[EmailData],
         sample_results: list[dict[str, Any]],
     ) -> None:
         """save_pending includes created_at timestamp."""
-        pending_file = tmp_path / "pending.json"
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=pending_file):
-            save_pending("personal", sample_emails, sample_results)
-            data = json.loads(pending_file.read_text())
-            assert "created_at" in data
+        data = _build_pending_payload("personal", sample_emails, sample_results)
+        assert "created_at" in data
 
     def test_save_pending_includes_all_results(
         self,
-        tmp_path: Path,
         sample_emails: list[EmailData],
         sample_results: list[dict[str, Any]],
     ) -> None:
         """save_pending includes all email results."""
-        pending_file = tmp_path / "pending.json"
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=pending_file):
-            save_pending("personal", sample_emails, sample_results)
-            data = json.loads(pending_file.read_text())
-            assert len(data["results"]) == 2
-            assert data["results"][0]["email_id"] == "abc123"
-            assert data["results"][0]["category"] == "NEEDS_REPLY"
+        data = _build_pending_payload("personal", sample_emails, sample_results)
+        assert len(data["results"]) == 2
+        assert data["results"][0].email_id == "abc123"
+        assert data["results"][0].category == Category.NEEDS_REPLY
+
+    def test_save_pending_leaves_no_temp_files(
+        self,
+        pending_file: Path,
+        sample_emails: list[EmailData],
+        sample_results: list[dict[str, Any]],
+    ) -> None:
+        """save_pending replaces pending.json without leaving temp files behind."""
+        save_pending("personal", sample_emails, sample_results)
+        save_pending("personal", sample_emails, sample_results)
+        assert pending_file.exists()
+        assert not list(pending_file.parent.glob("*.tmp"))
 
 
 class TestLoadPending:
     """Tests for load_pending function."""
 
-    def test_load_pending_returns_none_when_no_file(self, tmp_path: Path) -> None:
+    def test_load_pending_returns_none_when_no_file(self) -> None:
         """load_pending returns None when file doesn't exist."""
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=tmp_path / "pending.json"):
-            assert load_pending() is None
+        assert load_pending() is None
+
+    def test_load_pending_returns_none_for_empty_file(self, pending_file: Path) -> None:
+        """load_pending returns None when pending.json is empty."""
+        pending_file.write_bytes(b"")
+        assert load_pending() is None
 
-    def test_load_pending_returns_pending_results(self, tmp_path: Path) -> None:
+    def test_load_pending_returns_pending_results(self, pending_file: Path) -> None:
         """load_pending returns PendingResults object."""
-        pending_file = tmp_path / "pending.json"
         data = {
             "created_at": "2026-02-03T10:00:00",
             "results": [
@@ -134,28 +164,124 @@ class TestLoadPending:
                 }
             ]
         }
-        pending_file.write_text(json.dumps(data))
+        pending_file.write_bytes(orjson.dumps(data))
+
+        result = load_pending()
+        assert result is not None
+        assert len(result.results) == 1
+        assert result.results[0].email_id == "abc123"
 
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=pending_file):
-            result = load_pending()
-            assert result is not None
-            assert len(result.results) == 1
-            assert result.results[0].email_id == "abc123"
+    def test_load_pending_defaults_unknown_category_to_fyi(self, pending_file: Path) -> None:
+        """load_pending maps an unrecognized category to FYI."""
+        data = {
+            "created_at": "2026-02-03T10:00:00",
+            "results": [{"account": "personal", "email_id": "abc123", "category": "BOGUS"}],
+        }
+        pending_file.write_bytes(orjson.dumps(data))
+
+        result = load_pending()
+        assert result is not None
+        assert result.results[0].category == Category.FYI
+
+    def test_load_pending_defaults_non_string_category_to_fyi(
+        self, pending_file: Path
+    ) -> None:
+        """load_pending maps a hand-edited non-string category to FYI."""
+        data = {
+            "created_at": "2026-02-03T10:00:00",
+            "results": [{
+                "account": "personal",
+                "email_id": "abc123",
+                "category": ["FYI"],
+                "skip": False,
+                "subject": "",
+                "sender": "",
+            }],
+        }
+        pending_file.write_bytes(orjson.dumps(data))
+
+        result = load_pending()
+        assert result is not None
+        assert result.results[0].category == Category.FYI
+
+    def test_load_pending_reuses_result_for_unchanged_file(
+        self,
+        sample_emails: list[EmailData],
+        sample_results: list[dict[str, Any]],
+    ) -> None:
+        """load_pending returns the cached results until the file is rewritten."""
+        save_pending("personal", sample_emails, sample_results)
+        first = load_pending()
+        assert load_pending() is first
+
+        save_pending("personal", sample_emails[:1], sample_results[:1])
+        reloaded = load_pending()
+        assert reloaded is not first
+        assert reloaded is not None
+        assert len(reloaded.results) == 1
+
+    def test_load_pending_reads_compressed_file(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        pending_file: Path,
+        sample_emails: list[EmailData],
+        sample_results: list[dict[str, Any]],
+    ) -> None:
+        """Results saved above the compression threshold load back unchanged."""
+        monkeypatch.setattr("gmail_cleaner.pending.COMPRESS_THRESHOLD", 0)
+        save_pending("personal", sample_emails, sample_results)
+        assert pending_file.read_bytes()[:2] == b"\x1f\x8b"
+
+        result = load_pending()
+        assert result is not None
+        assert [r.email_id for r in result.results] == ["abc123", "def456"]
+        assert result.results[0].category == Category.NEEDS_REPLY
 
 
 class TestDeletePending:
     """Tests for delete_pending function."""
 
-    def test_delete_pending_removes_file(self, tmp_path: Path) -> None:
+    def test_delete_pending_removes_file(self, pending_file: Path) -> None:
         """delete_pending removes the pending.json file."""
-        pending_file = tmp_path / "pending.json"
         pending_file.write_text("{}")
 
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=pending_file):
-            delete_pending()
-            assert not pending_file.exists()
+        delete_pending()
+        assert not pending_file.exists()
 
-    def test_delete_pending_handles_missing_file(self, tmp_path: Path) -> None:
+    def test_delete_pending_handles_missing_file(self) -> None:
         """delete_pending doesn't error when file doesn't exist."""
-        with patch("gmail_cleaner.pending.get_pending_path", return_value=tmp_path / "pending.json"):
-            delete_pending()  # Should not raise
+        delete_pending()  # Should not raise
+
+
+class TestApplyPending:
+    """Tests for apply_pending function."""
+
+    def test_apply_pending_groups_emails_per_account(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """apply_pending hands each account exactly its own emails."""
+        config = make_config(personal="me@gmail.com", work="me@work.com")
+        pending = PendingResults(
+            created_at=datetime(2026, 2, 3),
+            results=[
+                PendingEmail("personal", "a", Category.FYI, False, "", ""),
+                PendingEmail("work", "b", Category.ARCHIVE, False, "", ""),
+                PendingEmail("personal", "c", Category.ARCHIVE, False, "", ""),
+                PendingEmail("personal", "d", Category.FYI, True, "", ""),
+                PendingEmail("personal", "e", Category.FYI, False, "", ""),
+            ],
+        )
+
+        calls: dict[str, list[dict[str, Any]]] = {}
+
+        def fake_apply_actions(
+            config: Config, account_name: str, results: list[dict[str, Any]]
+        ) -> int:
+            calls[account_name] = results
+            return len(results)
+
+        monkeypatch.setattr("gmail_cleaner.gmail.apply_actions", fake_apply_actions)
+        assert apply_pending(pending, config) == 5
+
+        assert sorted(r["email_id"] for r in calls["personal"]) == ["a", "c", "d", "e"]
+        assert [r["email_id"] for r in calls["work"]] == ["b"]
@@ -0,0 +1,120 @@
+"""Tests for Gmail API retry helpers."""
+
+from typing import Any
+from unittest.mock import patch, MagicMock
+
+import httplib2  # type: ignore[import-untyped]
+import pytest
+from googleapiclient.errors import HttpError  # type: ignore[import-untyped]
+
+from gmail_cleaner._retry import (
+    MAX_DELAY,
+    backoff_delay,
+    execute_batch_with_backoff,
+    execute_with_backoff,
+    is_retryable,
+)
+
+
+def make_http_error(
+    status: int,
+    content: bytes = b"",
+    headers: dict[str, str] | None = None,
+) -> HttpError:
+    """Build an HttpError with the given status and response headers."""
+    resp = httplib2.Response({"status": status, **(headers or {})})
+    return HttpError(resp, content)
+
+
+class TestIsRetryable:
+    """Tests for is_retryable function."""
+
+    def test_rate_limit_is_retryable(self) -> None:
+        """is_retryable returns True for 429 responses."""
+        assert is_retryable(make_http_error(429)) is True
+
+    def test_not_found_is_not_retryable(self) -> None:
+        """is_retryable returns False for 404 responses."""
+        assert is_retryable(make_http_error(404)) is False
+
+    def test_user_rate_limit_403_is_retryable(self) -> None:
+        """is_retryable returns True for Gmail's 403 userRateLimitExceeded."""
+        content = b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}'
+        error = make_http_error(403, content)
+        assert is_retryable(error) is True
+
+
+class TestBackoff:
+    """Tests for backoff_delay and execute_with_backoff."""
+
+    def test_backoff_delay_honors_retry_after(self) -> None:
+        """backoff_delay uses the Retry-After header when present."""
+        error = make_http_error(429, headers={"retry-after": "7"})
+        assert backoff_delay(0, error) == 7.0
+
+    def test_backoff_delay_caps_retry_after(self) -> None:
+        """backoff_delay never waits longer than MAX_DELAY for Retry-After."""
+        error = make_http_error(429, headers={"retry-after": "86400"})
+        assert backoff_delay(0, error) == MAX_DELAY
+
+    def test_backoff_delay_grows_exponentially(self) -> None:
+        """backoff_delay doubles per attempt plus under a second of jitter."""
+        assert 4.0 <= backoff_delay(2) < 5.0
+
+    @patch("gmail_cleaner._retry.time.sleep")
+    def test_execute_with_backoff_retries_until_success(self, mock_sleep: MagicMock) -> None:
+        """execute_with_backoff retries retryable errors and returns the result."""
+        request = MagicMock()
+        request.execute.side_effect = [make_http_error(503), {"id": "abc"}]
+
+        assert execute_with_backoff(request) == {"id": "abc"}
+        assert request.execute.call_count == 2
+        mock_sleep.assert_called_once()
+
+    @patch("gmail_cleaner._retry.time.sleep")
+    def test_execute_with_backoff_raises_non_retryable(self, mock_sleep: MagicMock) -> None:
+        """execute_with_backoff re-raises non-retryable errors immediately."""
+        request = MagicMock()
+        request.execute.side_effect = make_http_error(400)
+
+        with pytest.raises(HttpError):
+            execute_with_backoff(request)
+        mock_sleep.assert_not_called()
+
+
+class TestExecuteBatchWithBackoff:
+    """Tests for execute_batch_with_backoff function."""
+
+    @patch("gmail_cleaner._retry.time.sleep")
+    def test_requeues_rate_limited_items(self, mock_sleep: MagicMock) -> None:
+        """execute_batch_with_backoff re-sends only items that were rate limited."""
+        sent: list[list[str]] = []
+        rate_limited = {"b"}
+
+        def new_batch(callback: Any) -> MagicMock:
+            batch = MagicMock()
+            ids: list[str] = []
+            batch.add.side_effect = lambda req, request_id: ids.append(request_id)
+
+            def execute() -> None:
+                sent.append(list(ids))
+                for request_id in ids:
+                    if request_id in rate_limited:
+                        rate_limited.discard(request_id)
+                        callback(request_id, None, make_http_error(429))
+                    else:
+                        callback(request_id, {"id": request_id}, None)
+
+            batch.execute.side_effect = execute
+            return batch
+
+        service = MagicMock()
+        service.new_batch_http_request.side_effect = new_batch
+        callback = MagicMock()
+
+        requests = {"a": "req-a", "b": "req-b"}
+        execute_batch_with_backoff(service, requests, callback, batch_size=100)
+
+        assert sent == [["a", "b"], ["b"]]
+        assert sorted(c.args[0] for c in callback.call_args_list) == ["a", "b"]
+        assert all(c.args[2] is None for c in callback.call_args_list)